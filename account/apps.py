@@ -6,4 +6,4 @@ class AccountConfig(AppConfig):
     name = "account"
 
     def ready(self):
-        pass
+        from . import roles  # noqa: F401
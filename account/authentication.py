@@ -0,0 +1,87 @@
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from account.models import UserProfile
+from account.roles import aget_user_access, get_user_access
+
+
+class PayloadUser(TokenUser):
+    """
+    Stateless user built from the claims of an already validated access token.
+
+    ``id`` and ``username`` come straight from the token. ``role`` and
+    ``is_active`` are read through ``account.roles`` rather than the token
+    claims, so a demotion, deactivation or deletion applies before the token
+    expires. Any other attribute is read from the ``UserProfile`` row, which
+    is only loaded the first time such an attribute is requested.
+    """
+
+    @cached_property
+    def access(self):
+        return get_user_access(self.id)
+
+    @property
+    def role(self):
+        return self.access.role
+
+    @property
+    def is_active(self):
+        return self.access.is_active
+
+    async def arole(self):
+        """
+        Async counterpart of ``role``; later sync reads reuse its lookup
+        """
+        if "access" not in self.__dict__:
+            self.__dict__["access"] = await aget_user_access(self.id)
+        return self.role
+
+    @cached_property
+    def profile(self):
+        return UserProfile.objects.get(pk=self.id)
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or attr == "token":
+            raise AttributeError(attr)
+        if attr in self.token:
+            return self.token[attr]
+        return getattr(self.profile, attr)
+
+
+class TokenPayloadAuthentication(JWTAuthentication):
+    """
+    Reuses the payload decoded by ``AccessControlMiddleware`` instead of
+    decoding the token a second time. The user row is only read through the
+    cached ``account.roles`` lookup.
+    """
+
+    def authenticate(self, request):
+        user = getattr(request._request, "user", None)
+        payload = getattr(request._request, "token_payload", None)
+        if payload is None:
+            # Routes skipped by the middleware still get regular JWT checks.
+            return super().authenticate(request)
+
+        if payload.get(api_settings.TOKEN_TYPE_CLAIM) != "access":
+            raise InvalidToken({"detail": "Token has wrong type"})
+
+        if not isinstance(user, PayloadUser):
+            return self.get_user(payload), payload
+        return self.check_user(user), payload
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+        return self.check_user(PayloadUser(validated_token))
+
+    @staticmethod
+    def check_user(user):
+        # Deleted users resolve as inactive, like JWTAuthentication.get_user
+        if not user.is_active:
+            raise AuthenticationFailed(
+                "User is inactive or no longer exists", code="user_inactive"
+            )
+        return user
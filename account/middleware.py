@@ -1,28 +1,44 @@
 import datetime
 import functools
-import json
 import jwt
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.utils import timezone
 from django.http import JsonResponse
 from rest_framework import status
-from account.serializers import User
+from account.authentication import PayloadUser
+from account.routes import get_route_policy
+from account.token_cache import CachedToken, token_cache
 
 
 class AccessControlMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.process_request(request)
+        return response or self.get_response(request)
+
+    async def __acall__(self, request):
+        # Token checks are CPU-only, so they run inline on the event loop
+        response = self.process_request(request)
+        return response or await self.get_response(request)
+
+    def process_request(self, request):
         # Bypass authentication for public routes
-        public_routes = [
-            "/account/register/",
-            "/admin/",
-            "/account/login/",
-            "/account/verify_signup_email/",
-        ]
-        if any(request.path.startswith(route) for route in public_routes):
-            return self.get_response(request)
+        policy = get_route_policy(request)
+        if policy.public:
+            return None
+
+        if policy.required_roles:
+            request.required_roles = policy.required_roles
 
         # Check for Authorization header
         auth_header = request.META.get("HTTP_AUTHORIZATION", "")
@@ -38,72 +54,87 @@ class AccessControlMiddleware:
             validated_token = self.validate_token(token, request)
 
             # Attach user and token info to request
-            request.user = validated_token.get("user")
+            request.user = PayloadUser(validated_token)
             request.token_payload = validated_token
         except TokenValidationError as e:
             return JsonResponse({"error": str(e)}, status=status.HTTP_401_UNAUTHORIZED)
 
-        return self.get_response(request)
+        return None
 
     def validate_token(self, token, request):
         """
         Comprehensive token validation with multiple checks
         """
+        now = datetime.datetime.utcnow().timestamp()
+
+        # Signature, expiry and age checks only run once per token; repeated
+        # requests are served from the verified-token cache.
+        entry = token_cache.get(token, now)
+        if entry is None:
+            entry = self.decode_token(token, now)
+            token_cache.set(token, entry)
+
+        payload = entry.payload
+
+        # Role-based access control
+        user_roles = payload.get("roles", [])
+        required_roles = getattr(request, "required_roles", [])
+
+        if required_roles and not any(role in user_roles for role in required_roles):
+            raise TokenValidationError("Insufficient permissions")
+
+        # Time-based access control
+        current_time = datetime.datetime.utcnow().time()
+
+        if entry.access_start and current_time < entry.access_start:
+            raise TokenValidationError("Access not allowed before specified time")
+
+        if entry.access_end and current_time > entry.access_end:
+            raise TokenValidationError("Access not allowed after specified time")
+
+        return payload
+
+    def decode_token(self, token, now):
+        """
+        Decode and verify the token, returning a cacheable entry
+        """
         try:
             # Decode token
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-
-            # Check token expiration
-            exp = payload.get("exp")
-            if not exp or exp < datetime.datetime.utcnow().timestamp():
-                raise TokenValidationError("Token has expired")
-
-            # Optional: Check issued at time (prevent very old tokens)
-            iat = payload.get("iat")
-            max_token_age = 30 * 24 * 60 * 60  # 30 days
-            if iat and (datetime.datetime.utcnow().timestamp() - iat > max_token_age):
-                raise TokenValidationError("Token is too old")
-
-            # Role-based access control
-            user_roles = payload.get("roles", [])
-            required_roles = getattr(request, "required_roles", [])
-
-            if required_roles and not any(
-                role in user_roles for role in required_roles
-            ):
-                raise TokenValidationError("Insufficient permissions")
-
-            # Time-based access control
-            current_time = datetime.datetime.utcnow().time()
-            access_start = payload.get("access_start")
-            access_end = payload.get("access_end")
-
-            if access_start or access_end:
-                if (
-                    access_start
-                    and current_time
-                    < datetime.datetime.strptime(access_start, "%H:%M").time()
-                ):
-                    raise TokenValidationError(
-                        "Access not allowed before specified time"
-                    )
-
-                if (
-                    access_end
-                    and current_time
-                    > datetime.datetime.strptime(access_end, "%H:%M").time()
-                ):
-                    raise TokenValidationError(
-                        "Access not allowed after specified time"
-                    )
-
-            return payload
-
         except jwt.ExpiredSignatureError:
             raise TokenValidationError("Token signature has expired")
         except jwt.InvalidTokenError:
             raise TokenValidationError("Invalid token")
 
+        # Check token expiration
+        exp = payload.get("exp")
+        if not exp or exp < now:
+            raise TokenValidationError("Token has expired")
+
+        # Optional: Check issued at time (prevent very old tokens)
+        iat = payload.get("iat")
+        max_token_age = 30 * 24 * 60 * 60  # 30 days
+        if iat and (now - iat > max_token_age):
+            raise TokenValidationError("Token is too old")
+
+        access_start = payload.get("access_start")
+        access_end = payload.get("access_end")
+
+        return CachedToken(
+            payload=payload,
+            access_start=(
+                datetime.datetime.strptime(access_start, "%H:%M").time()
+                if access_start
+                else None
+            ),
+            access_end=(
+                datetime.datetime.strptime(access_end, "%H:%M").time()
+                if access_end
+                else None
+            ),
+            expires_at=min(exp, iat + max_token_age) if iat else exp,
+        )
+
 
 def require_roles(*roles):
     """
@@ -168,8 +199,13 @@ def create_limited_access_token(user):
 
 
 class TimeBasedAccessMiddleware:
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
         self.role_time_restrictions = {
             "User": {
                 "start_time": timezone.datetime.strptime("20:00", "%H:%M").time(),
@@ -179,51 +215,34 @@ class TimeBasedAccessMiddleware:
         }
 
     def __call__(self, request):
-        # Skip time check for public routes
-        public_routes = [
-            "/account/register/",
-            "/admin/",
-            "/account/login/",
-            "/account/logout/",
-            "/base/tasks/",
-            "/base/tasks/<int:pk>/delete/",
-            "/base/projects/<int:pk>/",
-            "/account/verify_signup_email/",
-        ]
-        if any(request.path.startswith(route) for route in public_routes):
-            return self.get_response(request)
-
-        # Extract username and password from the request body
-        if request.body:
-            try:
-                request_data = json.loads(request.body)  # Parse JSON body
-                username = request_data.get(
-                    "username"
-                )  # Get username from the parsed JSON
-                print(username, "usernameusernameusername")
-            except json.JSONDecodeError:
-                return JsonResponse({"error": "Invalid JSON body."}, status=400)
-        else:
-            return JsonResponse({"error": "Request body is empty."}, status=400)
-
-        if not username:
-            return JsonResponse(
-                {"error": "Username not provided in the request."}, status=400
-            )
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self.is_restricted(request):
+            # PayloadUser caches the lookup for the views of this request
+            response = self.check_access(request.user.role)
+            if response:
+                return response
+        return self.get_response(request)
 
-        try:
-            # Retrieve the user by username
-            user = User.objects.get(
-                username=username
-            )  # Assuming username is stored in the 'username' field of User model
-            user_role = (
-                user.role
-            )  # Assuming role is stored in the 'role' field of User model
-        except User.DoesNotExist:
-            return JsonResponse(
-                {"error": "User with this username not found."}, status=404
-            )
+    async def __acall__(self, request):
+        if self.is_restricted(request):
+            response = self.check_access(await request.user.arole())
+            if response:
+                return response
+        return await self.get_response(request)
 
+    def is_restricted(self, request):
+        """
+        Whether the role of the request's user must be checked
+        """
+        # Skip time check for routes without a time restriction
+        if not get_route_policy(request).time_restricted:
+            return False
+
+        # Identity comes from the token validated by AccessControlMiddleware
+        return getattr(request, "token_payload", None) is not None
+
+    def check_access(self, user_role):
         current_time = timezone.localtime().time()
 
         # Check time-based access for the user's role
@@ -242,7 +261,7 @@ class TimeBasedAccessMiddleware:
                     status=403,
                 )
 
-        return self.get_response(request)
+        return None
 
 
 # Decorator for additional time-based access control
@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from account.models import UserProfile
+
+
+ROLE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# What a request needs to know about the user of a valid token
+UserAccess = namedtuple("UserAccess", ["role", "is_active"])
+
+# Cached for deleted users too, so their tokens keep being refused without
+# a query per request
+MISSING_USER = UserAccess(role=None, is_active=False)
+
+
+def user_access_key(user_id):
+    return f"user_access:{user_id}"
+
+
+def _access_of(row):
+    return MISSING_USER if row is None else UserAccess(*row)
+
+
+def get_user_access(user_id):
+    """
+    Return the current role and active flag of a user, reading the
+    database only on a miss
+    """
+    key = user_access_key(user_id)
+    access = cache.get(key)
+    if access is None:
+        access = _access_of(
+            UserProfile.objects.filter(pk=user_id)
+            .values_list("role", "is_active")
+            .first()
+        )
+        cache.set(key, tuple(access), timeout=ROLE_CACHE_TIMEOUT)
+    return UserAccess(*access)
+
+
+async def aget_user_access(user_id):
+    key = user_access_key(user_id)
+    access = await cache.aget(key)
+    if access is None:
+        access = _access_of(
+            await UserProfile.objects.filter(pk=user_id)
+            .values_list("role", "is_active")
+            .afirst()
+        )
+        await cache.aset(key, tuple(access), timeout=ROLE_CACHE_TIMEOUT)
+    return UserAccess(*access)
+
+
+@receiver(post_save, sender=UserProfile)
+def refresh_user_access(sender, instance, **kwargs):
+    cache.set(
+        user_access_key(instance.pk),
+        (instance.role, instance.is_active),
+        timeout=ROLE_CACHE_TIMEOUT,
+    )
+
+
+@receiver(post_delete, sender=UserProfile)
+def forget_user_access(sender, instance, **kwargs):
+    cache.set(
+        user_access_key(instance.pk), tuple(MISSING_USER), timeout=ROLE_CACHE_TIMEOUT
+    )
@@ -0,0 +1,127 @@
+import functools
+from collections import namedtuple
+
+from django.urls import URLResolver, get_resolver
+
+
+RoutePolicy = namedtuple("RoutePolicy", ["public", "time_restricted", "required_roles"])
+
+DEFAULT_POLICY = RoutePolicy(public=False, time_restricted=True, required_roles=())
+PUBLIC = RoutePolicy(public=True, time_restricted=False, required_roles=())
+UNRESTRICTED = RoutePolicy(public=False, time_restricted=False, required_roles=())
+
+# Policies keyed by URL name, or by namespace for whole included URLconfs.
+# Routes that are not listed get DEFAULT_POLICY.
+ROUTE_POLICIES = {
+    # account
+    "register": PUBLIC,
+    "token_obtain_pair": PUBLIC,
+    "verify_signup_email": PUBLIC,
+    "logout": UNRESTRICTED,
+    # base
+    "task_list": UNRESTRICTED,
+    "task_changes": UNRESTRICTED,
+    "task_export": UNRESTRICTED,
+    "task_archive": UNRESTRICTED,
+    "task_archive_detail": UNRESTRICTED,
+    "task_update": UNRESTRICTED,
+    "task_delete": UNRESTRICTED,
+    "task_bulk": UNRESTRICTED,
+    "task_bulk_transition": UNRESTRICTED,
+    "task_bulk_delete": UNRESTRICTED,
+    "pending-tasks": UNRESTRICTED,
+    "project_detail": UNRESTRICTED,
+    "project_tasks": UNRESTRICTED,
+    "task_list_async": UNRESTRICTED,
+    "pending-tasks-async": UNRESTRICTED,
+    "project_detail_async": UNRESTRICTED,
+    # namespaces
+    "admin": PUBLIC,
+}
+
+
+class _Node:
+    __slots__ = ("children", "wildcard", "policy", "subtree_policy")
+
+    def __init__(self):
+        self.children = {}
+        self.wildcard = None
+        self.policy = None
+        self.subtree_policy = None
+
+
+class RoutePolicyTable:
+    """
+    Prefix trie of the project's URL patterns, one path segment per level.
+
+    Converter segments such as ``<int:pk>`` become wildcard nodes, so a
+    request path is matched in O(depth) without going through Django's
+    resolver.
+    """
+
+    def __init__(self, urlconf=None, policies=None):
+        self.policies = ROUTE_POLICIES if policies is None else policies
+        self.root = _Node()
+        self._add_patterns(get_resolver(urlconf).url_patterns, "")
+
+    def _add_patterns(self, patterns, prefix):
+        for pattern in patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                if pattern.namespace in self.policies:
+                    node = self._node_for(route.rstrip("/"))
+                    node.subtree_policy = self.policies[pattern.namespace]
+                else:
+                    self._add_patterns(pattern.url_patterns, route)
+            elif pattern.name:
+                node = self._node_for(route)
+                node.policy = self.policies.get(pattern.name, DEFAULT_POLICY)
+
+    def _node_for(self, route):
+        node = self.root
+        for segment in route.split("/"):
+            if "<" in segment:
+                if node.wildcard is None:
+                    node.wildcard = _Node()
+                node = node.wildcard
+            else:
+                node = node.children.setdefault(segment, _Node())
+        return node
+
+    def match(self, path):
+        policy = self._match(self.root, path.lstrip("/").split("/"), 0, None)
+        return policy or DEFAULT_POLICY
+
+    def _match(self, node, segments, index, inherited):
+        if node.subtree_policy is not None:
+            inherited = node.subtree_policy
+        if index == len(segments):
+            return node.policy or inherited
+
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            policy = self._match(child, segments, index + 1, inherited)
+            if policy is not None:
+                return policy
+        if node.wildcard is not None and segment:
+            policy = self._match(node.wildcard, segments, index + 1, inherited)
+            if policy is not None:
+                return policy
+        return inherited
+
+
+@functools.lru_cache(maxsize=None)
+def get_route_policies(urlconf=None):
+    return RoutePolicyTable(urlconf)
+
+
+def get_route_policy(request):
+    """
+    Return the policy of the requested route, matching it at most once
+    """
+    policy = getattr(request, "route_policy", None)
+    if policy is None:
+        policy = get_route_policies().match(request.path_info)
+        request.route_policy = policy
+    return policy
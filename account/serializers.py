@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import UserProfile
 
@@ -32,3 +33,14 @@ class TokenRevokeSerializer(serializers.Serializer):
         token = RefreshToken(refresh_token)
         token.blacklist()
         return TokenRevokeSerializer()
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # Carry the identity views need so requests can be served without
+        # loading the user from the database.
+        token = super().get_token(user)
+        token["username"] = user.username
+        token["role"] = user.role
+        return token
@@ -1 +1,247 @@
-# Create your tests here.
+import datetime
+import time
+from unittest.mock import Mock, patch
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from account.authentication import PayloadUser
+from account.middleware import AccessControlMiddleware, TokenValidationError
+from account.models import UserProfile
+from account.routes import DEFAULT_POLICY, PUBLIC, UNRESTRICTED, RoutePolicyTable
+from account.serializers import RoleTokenObtainPairSerializer
+from account.token_cache import VerifiedTokenCache, token_cache
+from base.models import Project, Task
+
+
+TEST_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class PayloadUserRoleTests(TestCase):
+    def setUp(self):
+        self.manager = UserProfile.objects.create_user(
+            username="manager",
+            email="manager@example.com",
+            role="Manager",
+            is_active=True,
+        )
+        self.token = RoleTokenObtainPairSerializer.get_token(self.manager).access_token
+
+    def test_role_follows_demotion_before_token_expiry(self):
+        self.assertEqual(PayloadUser(self.token).role, "Manager")
+
+        self.manager.role = "User"
+        self.manager.save()
+
+        self.assertEqual(self.token["role"], "Manager")
+        self.assertEqual(PayloadUser(self.token).role, "User")
+
+    def test_demoted_manager_loses_manager_views(self):
+        project = Project.objects.create(
+            name="p", description="d", created_by=self.manager
+        )
+        Task.objects.create(
+            title="t",
+            description="d",
+            due_date="2030-01-01T00:00:00Z",
+            status="Pending Approval",
+            project=project,
+            created_by=self.manager,
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        url = reverse("pending-tasks")
+        self.assertEqual(len(client.get(url).json()["results"]), 1)
+
+        self.manager.role = "User"
+        self.manager.save()
+
+        self.assertEqual(client.get(url).json()["results"], [])
+
+    def test_request_reads_the_role_once(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        # /base/create/ is time-restricted, so the middleware checks the role
+        with patch("account.roles.cache", Mock(wraps=cache)) as role_cache:
+            response = client.post(reverse("task_create"), {}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(role_cache.get.call_count, 1)
+
+    async def test_async_views_resolve_role_without_sync_queries(self):
+        await cache.aclear()
+        response = await self.async_client.get(
+            reverse("task_list_async"),
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(CACHES=TEST_CACHES)
+class RevokedUserTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = UserProfile.objects.create_user(
+            username="user", email="user@example.com", role="User", is_active=True
+        )
+        owner = UserProfile.objects.create_user(
+            username="owner", email="owner@example.com", role="Admin", is_active=True
+        )
+        self.project = Project.objects.create(
+            name="p", description="d", created_by=owner
+        )
+        Task.objects.create(
+            title="t",
+            description="d",
+            due_date="2030-01-01T00:00:00Z",
+            status="Completed",
+            project=self.project,
+            created_by=owner,
+        )
+        token = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.headers["Authorization"])
+
+    def assertRefused(self):
+        response = self.client.get(reverse("task_list"))
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post(
+            reverse("task_bulk_delete"),
+            {"filter": {"project": self.project.pk}},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_token_of_active_user_is_served(self):
+        self.assertEqual(self.client.get(reverse("task_list")).status_code, 200)
+
+    def test_token_of_deleted_user_is_refused(self):
+        self.client.get(reverse("task_list"))
+        self.user.delete()
+        self.assertRefused()
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_token_of_inactive_user_is_refused(self):
+        self.client.get(reverse("task_list"))
+        self.user.is_active = False
+        self.user.save()
+        self.assertRefused()
+
+    async def test_async_views_refuse_deleted_user(self):
+        await self.user.adelete()
+        response = await self.async_client.get(
+            reverse("task_list_async"), headers=self.headers
+        )
+        self.assertEqual(response.status_code, 401)
+
+    async def test_async_views_refuse_inactive_user(self):
+        self.user.is_active = False
+        await self.user.asave()
+        await cache.aclear()
+        response = await self.async_client.get(
+            reverse("task_list_async"), headers=self.headers
+        )
+        self.assertEqual(response.status_code, 401)
+
+
+class VerifiedTokenCacheTests(SimpleTestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.middleware = AccessControlMiddleware(lambda request: HttpResponse())
+        self.request = RequestFactory().get("/base/tasks/")
+        self.now = int(time.time())
+
+    def token(self, **claims):
+        payload = {"user_id": 1, "iat": self.now, "exp": self.now + 3600, **claims}
+        return jwt.encode(payload, settings.SECRET_KEY, algorithm="HS256")
+
+    def test_hit_skips_decoding(self):
+        token = self.token()
+        with patch("account.middleware.jwt.decode", wraps=jwt.decode) as decode:
+            first = self.middleware.validate_token(token, self.request)
+            second = self.middleware.validate_token(token, self.request)
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertEqual(
+            token_cache.stats(), {"size": 1, "maxsize": 1024, "hits": 1, "misses": 1}
+        )
+
+    def test_entry_expires_at_exp(self):
+        token = self.token(exp=self.now + 60)
+        token_cache.set(token, self.middleware.decode_token(token, self.now))
+        self.assertIsNotNone(token_cache.get(token, self.now + 59))
+        self.assertIsNone(token_cache.get(token, self.now + 60))
+        self.assertEqual(token_cache.stats()["size"], 0)
+
+    def test_entry_expires_at_max_token_age(self):
+        max_token_age = 30 * 24 * 60 * 60
+        token = self.token(iat=self.now - max_token_age + 60)
+        token_cache.set(token, self.middleware.decode_token(token, self.now))
+        self.assertIsNotNone(token_cache.get(token, self.now + 59))
+        self.assertIsNone(token_cache.get(token, self.now + 60))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        lru = VerifiedTokenCache(maxsize=2)
+        tokens = {name: self.token(jti=name) for name in "abc"}
+        entry = self.middleware.decode_token(tokens["a"], self.now)
+        lru.set(tokens["a"], entry)
+        lru.set(tokens["b"], entry)
+        lru.get(tokens["a"], self.now)
+        lru.set(tokens["c"], entry)
+
+        self.assertIsNone(lru.get(tokens["b"], self.now))
+        self.assertIsNotNone(lru.get(tokens["a"], self.now))
+        self.assertIsNotNone(lru.get(tokens["c"], self.now))
+        self.assertEqual(lru.stats(), {"size": 2, "maxsize": 2, "hits": 3, "misses": 1})
+
+    def test_access_window_is_checked_on_a_hit(self):
+        # A one-hour window twelve hours away from now
+        hour = 13 if datetime.datetime.utcnow().hour < 12 else 1
+        token = self.token(access_start=f"{hour:02}:00", access_end=f"{hour:02}:59")
+        token_cache.set(token, self.middleware.decode_token(token, self.now))
+        with patch("account.middleware.jwt.decode") as decode:
+            with self.assertRaisesMessage(TokenValidationError, "Access not allowed"):
+                self.middleware.validate_token(token, self.request)
+        decode.assert_not_called()
+        self.assertEqual(token_cache.stats()["hits"], 1)
+
+
+class RoutePolicyTableTests(SimpleTestCase):
+    def setUp(self):
+        self.table = RoutePolicyTable()
+
+    def test_policies(self):
+        cases = [
+            ("/admin/", PUBLIC),
+            ("/admin/account/userprofile/1/change/", PUBLIC),
+            ("/account/verify_signup_email/a@example.com/1234", PUBLIC),
+            ("/account/register/", PUBLIC),
+            ("/base/projects/5/", UNRESTRICTED),
+            ("/base/projects/5/tasks/", UNRESTRICTED),
+            # A literal segment wins over the <int:pk> sibling
+            ("/base/projects/create/", DEFAULT_POLICY),
+            # Bulk writes are unrestricted, like the single-task update
+            ("/base/tasks/5/", UNRESTRICTED),
+            ("/base/tasks/bulk/", UNRESTRICTED),
+            ("/base/tasks/bulk/transition/", UNRESTRICTED),
+            ("/base/tasks/bulk/delete/", UNRESTRICTED),
+            ("/base/create/", DEFAULT_POLICY),
+            ("/base/no/such/route/", DEFAULT_POLICY),
+            ("/", DEFAULT_POLICY),
+        ]
+        for path, policy in cases:
+            with self.subTest(path=path):
+                self.assertEqual(self.table.match(path), policy)
+
+    def test_unlisted_routes_get_the_default_policy(self):
+        table = RoutePolicyTable(policies={"project_detail": PUBLIC})
+        self.assertEqual(table.match("/base/projects/5/"), PUBLIC)
+        self.assertEqual(table.match("/admin/"), DEFAULT_POLICY)
+        self.assertEqual(table.match("/account/register/"), DEFAULT_POLICY)
@@ -0,0 +1,78 @@
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+
+
+# A validated token: the decoded payload, the pre-parsed access window and the
+# timestamp after which the entry must not be served any more.
+CachedToken = namedtuple(
+    "CachedToken", ["payload", "access_start", "access_end", "expires_at"]
+)
+
+
+class VerifiedTokenCache:
+    """
+    Bounded in-process LRU cache of validated JWT payloads.
+
+    Entries are keyed by a SHA-256 digest of the raw token so the bearer
+    credential itself is never kept in memory, and are dropped once their
+    ``expires_at`` timestamp has passed.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token, now):
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, token, entry):
+        if self.maxsize <= 0:
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_cache = VerifiedTokenCache(
+    maxsize=getattr(settings, "ACCESS_TOKEN_CACHE_SIZE", 1024)
+)
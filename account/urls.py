@@ -20,7 +20,7 @@ urlpatterns = [
     path(
         "verify_signup_email/<str:email>/<str:code>",
         VerifySignupEmail.as_view(),
-        name="register",
+        name="verify_signup_email",
     ),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("logout/", LogoutView.as_view(), name="logout"),
@@ -7,9 +7,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.utils import timezone
-from .serializers import UserRegistrationSerializer, TokenRevokeSerializer
+from .serializers import (
+    UserRegistrationSerializer,
+    TokenRevokeSerializer,
+    RoleTokenObtainPairSerializer,
+)
 from .models import UserProfile, EmailCode
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework.generics import CreateAPIView
 
@@ -21,7 +24,6 @@ class RegisterView(CreateAPIView):
 
 
 class LogoutView(APIView):
-    authentication_classes = [JWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = TokenRevokeSerializer
 
@@ -65,6 +67,7 @@ def time_restricted_access(view_func):
 
 class TimeRestrictedTokenObtainPairView(TokenObtainPairView):
     permission_classes = [AllowAny]
+    serializer_class = RoleTokenObtainPairSerializer
 
     @time_restricted_access
     def post(self, request, *args, **kwargs):
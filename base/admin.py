@@ -1,5 +1,11 @@
 from django.contrib import admin
-from .models import Project, Task, TaskConfigurations
+from .models import (
+    ArchivedTask,
+    ImportCheckpoint,
+    Project,
+    Task,
+    TaskConfigurations,
+)
 
 
 @admin.register(Project)
@@ -44,3 +50,5 @@ class TaskAdmin(admin.ModelAdmin):
 
 
 admin.site.register(TaskConfigurations)
+admin.site.register(ArchivedTask)
+admin.site.register(ImportCheckpoint)
@@ -0,0 +1,164 @@
+import time
+from django.conf import settings
+from django_redis import get_redis_connection
+from .bulk import update_tasks
+from .models import Task
+
+
+class ApprovalQueue:
+    """
+    Delayed approvals kept in a Redis sorted set scored by due timestamp.
+
+    A single periodic sweeper claims every due id at once, drops the ones
+    revoked while in flight and approves the rest with one UPDATE per batch,
+    instead of one countdown Celery message and one save per approval.
+
+    Claimed ids wait in a processing set, scored by lease expiry, until the
+    approvals are committed; ids of a failed sweep are put back in the
+    queue, and those of a sweeper that died are requeued once their lease
+    expires. Approving is idempotent, since the UPDATE only matches tasks
+    still pending approval.
+
+    ``client`` is any redis-py compatible client (e.g. ``fakeredis``); it
+    defaults to the connection of the default cache.
+    """
+
+    queue_key = "approvals:due"
+    processing_key = "approvals:processing"
+    revoked_key_prefix = "approvals:revoked:"
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_redis_connection("default")
+        return self._client
+
+    def revoked_key(self, task_id):
+        return f"{self.revoked_key_prefix}{task_id}"
+
+    def schedule(self, task_id, delay=None, now=None):
+        if delay is None:
+            delay = getattr(settings, "TASK_APPROVAL_DELAY", 300)
+        now = time.time() if now is None else now
+        pipe = self.client.pipeline()
+        pipe.delete(self.revoked_key(task_id))
+        pipe.zadd(self.queue_key, {task_id: now + delay})
+        pipe.execute()
+        return now + delay
+
+    def revoke(self, task_id):
+        """
+        Cancel a pending approval; returns whether one was still queued
+        """
+        removed = self.client.zrem(self.queue_key, task_id)
+        if not removed:
+            # Possibly popped by a sweep that has not committed yet
+            self.client.set(
+                self.revoked_key(task_id),
+                1,
+                ex=getattr(settings, "TASK_APPROVAL_REVOKE_TTL", 3600),
+            )
+        return bool(removed)
+
+    def is_scheduled(self, task_id):
+        return self.client.zscore(self.queue_key, task_id) is not None
+
+    def claim_due(self, now=None, lease=None):
+        """
+        Atomically move every approval due by ``now`` to the processing set
+        for ``lease`` seconds and return their ids
+        """
+        now = time.time() if now is None else now
+        if lease is None:
+            lease = getattr(settings, "TASK_APPROVAL_LEASE", 300)
+
+        def claim(pipe):
+            due = pipe.zrangebyscore(self.queue_key, "-inf", now)
+            pipe.multi()
+            if due:
+                pipe.zrem(self.queue_key, *due)
+                pipe.zadd(self.processing_key, dict.fromkeys(due, now + lease))
+            return due
+
+        due = self.client.transaction(claim, self.queue_key, value_from_callable=True)
+        return [int(task_id) for task_id in due]
+
+    def requeue_expired(self, now=None):
+        """
+        Put back the claimed approvals whose lease ran out, i.e. whose
+        sweeper died before finishing; returns how many were requeued
+        """
+        now = time.time() if now is None else now
+
+        def requeue(pipe):
+            expired = pipe.zrangebyscore(self.processing_key, "-inf", now)
+            pipe.multi()
+            if expired:
+                pipe.zrem(self.processing_key, *expired)
+                pipe.zadd(self.queue_key, dict.fromkeys(expired, now))
+            return expired
+
+        expired = self.client.transaction(
+            requeue, self.processing_key, value_from_callable=True
+        )
+        return len(expired)
+
+    def release(self, task_ids, now=None):
+        """
+        Return claimed approvals to the queue, due at ``now``
+        """
+        if not task_ids:
+            return
+        now = time.time() if now is None else now
+        pipe = self.client.pipeline(transaction=True)
+        pipe.zrem(self.processing_key, *task_ids)
+        pipe.zadd(self.queue_key, dict.fromkeys(task_ids, now))
+        pipe.execute()
+
+    def ack(self, task_ids):
+        """
+        Forget claimed approvals once their outcome is committed
+        """
+        if task_ids:
+            self.client.zrem(self.processing_key, *task_ids)
+
+    def drop_revoked(self, task_ids):
+        pipe = self.client.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.exists(self.revoked_key(task_id))
+        revoked = pipe.execute()
+        return [
+            task_id for task_id, is_revoked in zip(task_ids, revoked) if not is_revoked
+        ]
+
+    def sweep(self, now=None, batch_size=None):
+        """
+        Approve every due task that is still pending approval and return the
+        number of tasks approved
+        """
+        now = time.time() if now is None else now
+        self.requeue_expired(now)
+        claimed = self.claim_due(now)
+        if not claimed:
+            return 0
+        task_ids = self.drop_revoked(claimed)
+        try:
+            approved = update_tasks(
+                Task.objects.filter(status="Pending Approval"),
+                {"status": "Approved"},
+                ids=task_ids,
+                batch_size=batch_size,
+            )
+        except Exception:
+            # Revoked ones are settled; retry the rest on the next sweep
+            self.ack(set(claimed) - set(task_ids))
+            self.release(task_ids, now)
+            raise
+        self.ack(claimed)
+        return approved
+
+
+approval_queue = ApprovalQueue()
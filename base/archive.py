@@ -0,0 +1,96 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from account.models import UserProfile
+from .bulk import iter_id_batches
+from .caching import bump_task_versions
+from .counters import apply_counter_deltas
+from .models import ArchivedTask, Project, Task, TaskTombstone
+
+
+# Columns copied between Task and ArchivedTask
+ARCHIVE_FIELDS = [
+    field.attname
+    for field in ArchivedTask._meta.concrete_fields
+    if field.name != "archived_at"
+]
+
+
+def archive_task_batch(queryset, batch):
+    """
+    Copy the tasks of ``queryset`` whose ids are in ``batch`` into the
+    archive; call inside the transaction that deletes them.
+
+    An id already in the archive raises ``IntegrityError``, rolling the
+    chunk back rather than deleting a task whose copy was not written.
+    """
+    rows = queryset.filter(id__in=batch).select_for_update().values(*ARCHIVE_FIELDS)
+    archived = ArchivedTask.objects.bulk_create([ArchivedTask(**row) for row in rows])
+    return len(archived)
+
+
+def restore_tasks(queryset, batch_size=None):
+    """
+    Move archived tasks back into ``Task`` and return ``(restored, skipped)``.
+
+    Tasks whose project or creator no longer exists are skipped and stay
+    archived; a missing assignee is cleared, as ``on_delete=SET_NULL`` would.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, "TASK_BULK_BATCH_SIZE", 500)
+    restored = skipped = 0
+    for batch in iter_id_batches(queryset, batch_size=batch_size):
+        with transaction.atomic():
+            archived = list(
+                queryset.filter(id__in=batch).select_for_update().values(
+                    *ARCHIVE_FIELDS
+                )
+            )
+            project_ids = set(
+                Project.objects.filter(
+                    id__in={row["project_id"] for row in archived}
+                ).values_list("id", flat=True)
+            )
+            user_ids = set(
+                UserProfile.objects.filter(
+                    id__in={
+                        user_id
+                        for row in archived
+                        for user_id in (row["created_by_id"], row["assigned_to_id"])
+                        if user_id is not None
+                    }
+                ).values_list("id", flat=True)
+            )
+
+            now = timezone.now()
+            tasks, deltas, created_at = [], {}, {}
+            for row in archived:
+                if row["project_id"] not in project_ids:
+                    continue
+                if row["created_by_id"] not in user_ids:
+                    continue
+                if row["assigned_to_id"] not in user_ids:
+                    row["assigned_to_id"] = None
+                # A fresh updated_at lets sync clients pick the task up again
+                # and restarts its retention window (see base.retention)
+                tasks.append(Task(**{**row, "updated_at": now}))
+                created_at[row["id"]] = row["created_at"]
+                key = (row["project_id"], row["status"])
+                deltas[key] = deltas.get(key, 0) + 1
+            skipped += len(archived) - len(tasks)
+            if not tasks:
+                continue
+
+            ids = [task.id for task in tasks]
+            Task.objects.bulk_create(tasks)
+            # auto_now_add stamped created_at on insert; put the original back
+            for task in tasks:
+                task.created_at = created_at[task.id]
+            Task.objects.bulk_update(tasks, ["created_at"])
+            ArchivedTask.objects.filter(id__in=ids).delete()
+            TaskTombstone.objects.filter(task_id__in=ids).delete()
+            # bulk_create skips model signals, so maintain counters here
+            apply_counter_deltas(deltas)
+            bump_task_versions(*(project_id for project_id, _ in deltas))
+        restored += len(tasks)
+    return restored, skipped
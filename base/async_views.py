@@ -0,0 +1,89 @@
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from account.authentication import PayloadUser, TokenPayloadAuthentication
+from .models import Project
+from .views import TaskListView, PendingTasksView, ProjectDetailView
+
+
+class AsyncReadView(View):
+    """
+    Async GET endpoint reusing the querysets, permissions and serializers of
+    a DRF read view, with the database reads done through the async ORM.
+    """
+
+    http_method_names = ["get", "options"]
+    api_view_class = None
+
+    def setup_api_view(self, request, **kwargs):
+        drf_request = Request(request, authenticators=[TokenPayloadAuthentication()])
+        view = self.api_view_class(
+            request=drf_request, args=(), kwargs=kwargs, format_kwarg=None
+        )
+        view.check_permissions(drf_request)
+        return view
+
+    def render(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(
+            JSONRenderer().render(data),
+            content_type="application/json",
+            status=status_code,
+        )
+
+    async def get(self, request, **kwargs):
+        if isinstance(request.user, PayloadUser):
+            # Resolve the role here; the DRF view code reads it synchronously
+            await request.user.arole()
+        try:
+            return await self.read(self.setup_api_view(request, **kwargs))
+        except APIException as exc:
+            data = exc.detail
+            if not isinstance(data, (list, dict)):
+                data = {"detail": data}
+            return self.render(data, status_code=exc.status_code)
+
+    async def read(self, view):
+        raise NotImplementedError
+
+
+class AsyncTaskPageView(AsyncReadView):
+    async def read(self, view):
+        paginator = view.paginator
+        queryset = view.as_values(view.filter_queryset(view.get_queryset()))
+        queryset = paginator.get_page_queryset(queryset, view.request)
+        tasks = paginator.paginate_rows([task async for task in queryset])
+        data = view.serialize_rows(tasks)
+        return self.render(paginator.get_paginated_response(data).data)
+
+
+class AsyncTaskListView(AsyncTaskPageView):
+    api_view_class = TaskListView
+
+
+class AsyncPendingTasksView(AsyncTaskPageView):
+    api_view_class = PendingTasksView
+
+
+class AsyncProjectDetailView(AsyncReadView):
+    api_view_class = ProjectDetailView
+
+    async def read(self, view):
+        try:
+            project = await view.get_queryset().aget(pk=view.kwargs["pk"])
+        except Project.DoesNotExist:
+            return self.render(
+                {"detail": "No Project matches the given query."},
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        view.check_object_permissions(view.request, project)
+        paginator = view.get_tasks_paginator()
+        queryset = paginator.get_page_queryset(
+            view.get_tasks_queryset(project, paginator),
+            view.request,
+            base_url=view.get_tasks_url(project),
+        )
+        tasks = paginator.paginate_rows([task async for task in queryset])
+        return self.render(view.get_response_data(project, tasks, paginator))
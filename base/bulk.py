@@ -0,0 +1,305 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from account.models import UserProfile
+from .caching import bump_task_versions
+from .counters import apply_counter_deltas
+from .models import Project, Task, TaskTombstone
+from .serializers import BulkTaskSerializer
+
+
+def _pk(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _fail(result, errors):
+    result.update(status="error", errors=errors)
+
+
+def check_update_permission(user, task):
+    """
+    Same rules as TaskCreateUpdateView.put; returns an error message or None
+    """
+    if user.role == "User" and task.assigned_to_id != user.id:
+        return "Permission denied."
+    if user.role == "Manager" and task.status == "Completed":
+        return "Managers cannot update completed tasks."
+    return None
+
+
+def apply_task_batch(user, items, batch_size=None):
+    """
+    Create (items without ``id``) and partially update (items with ``id``)
+    tasks in one pass.
+
+    Referenced projects, assignees and tasks are each loaded with a single
+    ``IN`` query, valid items are written with ``bulk_create``/``bulk_update``
+    and one result is returned per item.
+
+    Everything runs in one transaction, with the updated tasks read
+    ``SELECT ... FOR UPDATE``, so permission checks, counter deltas and
+    versions come from rows no concurrent writer can change before the
+    write.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, "TASK_BULK_BATCH_SIZE", 500)
+    with transaction.atomic():
+        return _apply_task_batch(user, items, batch_size)
+
+
+def _apply_task_batch(user, items, batch_size):
+    project_ids, user_ids, task_ids = set(), set(), set()
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        project_ids.add(_pk(item.get("project")))
+        user_ids.add(_pk(item.get("assigned_to")))
+        task_ids.add(_pk(item.get("id")))
+    context = {
+        "projects": Project.objects.in_bulk(project_ids - {None}),
+        "users": UserProfile.objects.in_bulk(user_ids - {None}),
+    }
+    existing = Task.objects.select_for_update().in_bulk(task_ids - {None})
+
+    results, to_create, to_update = [], [], []
+    update_fields, deltas, seen, reassignments = set(), {}, set(), []
+    for index, item in enumerate(items):
+        result = {"index": index}
+        results.append(result)
+        if not isinstance(item, dict):
+            _fail(result, {"non_field_errors": ["Expected an object."]})
+            continue
+
+        if "id" not in item:
+            serializer = BulkTaskSerializer(data=item, context=context)
+            if not serializer.is_valid():
+                _fail(result, serializer.errors)
+                continue
+            task = Task(created_by_id=user.id, **serializer.validated_data)
+            to_create.append((result, task))
+            continue
+
+        task_id = _pk(item["id"])
+        task = existing.get(task_id)
+        if task is None:
+            _fail(result, {"id": ["Task not found."]})
+            continue
+        if task_id in seen:
+            _fail(result, {"id": ["Duplicate task id in batch."]})
+            continue
+        seen.add(task_id)
+        error = check_update_permission(user, task)
+        if error:
+            _fail(result, {"non_field_errors": [error]})
+            continue
+        serializer = BulkTaskSerializer(task, data=item, partial=True, context=context)
+        if not serializer.is_valid():
+            _fail(result, serializer.errors)
+            continue
+
+        previous = (task.project_id, task.status)
+        reassignments.append((task, task.assigned_to_id))
+        for field, value in serializer.validated_data.items():
+            setattr(task, field, value)
+            update_fields.add(field)
+        current = (task.project_id, task.status)
+        if previous != current:
+            deltas[previous] = deltas.get(previous, 0) - 1
+            deltas[current] = deltas.get(current, 0) + 1
+        result.update(status="updated", id=task.id)
+        to_update.append(task)
+
+    now = timezone.now()
+    for task in to_update:
+        task.updated_at = now
+        task.version = F("version") + 1
+
+    Task.objects.bulk_create([task for _, task in to_create], batch_size=batch_size)
+    if to_update and update_fields:
+        Task.objects.bulk_update(
+            to_update,
+            [*update_fields, "updated_at", "version"],
+            batch_size=batch_size,
+        )
+
+    # Bulk writes skip model signals, so keep counters and caches in step
+    for result, task in to_create:
+        result.update(status="created", id=task.id)
+        key = (task.project_id, task.status)
+        deltas[key] = deltas.get(key, 0) + 1
+    apply_counter_deltas(deltas)
+    TaskTombstone.record_reassignments(
+        (task.id, task.project_id, assignee_id, task.assigned_to_id)
+        for task, assignee_id in reassignments
+    )
+    bump_task_versions(
+        *(task.project_id for _, task in to_create),
+        *(task.project_id for task in to_update),
+        *(project_id for project_id, _ in deltas),
+    )
+
+    return results
+
+
+def scoped_task_queryset(user):
+    """
+    Push the per-role rules of the single-task views into the WHERE clause
+    """
+    queryset = Task.objects.all()
+    if user.role == "User":
+        return queryset.filter(assigned_to_id=user.id)
+    if user.role == "Manager":
+        return queryset.exclude(status="Completed")
+    return queryset
+
+
+def iter_id_batches(queryset, ids=None, batch_size=None):
+    """
+    Yield primary-key batches, either from an explicit id list or by walking
+    the queryset in id order
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, "TASK_BULK_BATCH_SIZE", 500)
+    if ids is not None:
+        ids = sorted(set(ids))
+        for start in range(0, len(ids), batch_size):
+            yield ids[start : start + batch_size]
+        return
+
+    last_id = 0
+    while True:
+        batch = list(
+            queryset.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]
+
+
+def _lock_batch(queryset, batch):
+    return list(
+        queryset.filter(id__in=batch)
+        .select_for_update()
+        .values_list("id", "project_id", "status", "assigned_to_id")
+    )
+
+
+def _written_rows(rows, written, is_written):
+    """
+    Narrow the locked ``rows`` to the ones the write really matched.
+
+    The write repeats the queryset's predicate, so where row locks are not
+    available (SQLite) a row changed since it was read is left alone; only
+    then is ``is_written(ids)`` asked which ids were written.
+    """
+    if written == len(rows):
+        return rows
+    ids = is_written([row[0] for row in rows])
+    return [row for row in rows if row[0] in ids]
+
+
+def update_tasks(queryset, changes, ids=None, batch_size=None):
+    """
+    Apply ``changes`` (status and/or assignee) with one UPDATE per batch and
+    return the number of tasks updated
+    """
+    updated = 0
+    for batch in iter_id_batches(queryset, ids, batch_size):
+        with transaction.atomic():
+            rows = _lock_batch(queryset, batch)
+            if not rows:
+                continue
+            now = timezone.now()
+            written = queryset.filter(id__in=[row[0] for row in rows]).update(
+                updated_at=now, version=F("version") + 1, **changes
+            )
+            rows = _written_rows(
+                rows,
+                written,
+                lambda ids: set(
+                    Task.objects.filter(id__in=ids, updated_at=now).values_list(
+                        "id", flat=True
+                    )
+                ),
+            )
+
+            deltas = {}
+            new_status = changes.get("status")
+            for _, project_id, old_status, _ in rows:
+                if new_status is not None and new_status != old_status:
+                    deltas[(project_id, old_status)] = (
+                        deltas.get((project_id, old_status), 0) - 1
+                    )
+                    deltas[(project_id, new_status)] = (
+                        deltas.get((project_id, new_status), 0) + 1
+                    )
+            apply_counter_deltas(deltas)
+            if "assigned_to_id" in changes:
+                TaskTombstone.record_reassignments(
+                    (task_id, project_id, assignee_id, changes["assigned_to_id"])
+                    for task_id, project_id, _, assignee_id in rows
+                )
+            bump_task_versions(*(row[1] for row in rows))
+        updated += len(rows)
+    return updated
+
+
+def delete_tasks(queryset, ids=None, batch_size=None):
+    """
+    Delete tasks with one DELETE per batch, recording tombstones, and return
+    the number of tasks deleted
+    """
+    deleted = 0
+    for batch in iter_id_batches(queryset, ids, batch_size):
+        deleted += delete_task_batch(queryset, batch)
+    return deleted
+
+
+def delete_task_batch(queryset, batch):
+    """
+    Delete the tasks of ``queryset`` whose ids are in ``batch`` in one short
+    transaction and return how many were deleted
+    """
+    with transaction.atomic():
+        rows = _lock_batch(queryset, batch)
+        if not rows:
+            return 0
+        # Nothing references Task, so the collector and its per-row
+        # signals can be skipped; their side effects are applied here.
+        written = queryset.filter(id__in=[row[0] for row in rows])._raw_delete(
+            Task.objects.db
+        )
+        rows = _written_rows(
+            rows,
+            written,
+            lambda ids: set(ids)
+            - set(Task.objects.filter(id__in=ids).values_list("id", flat=True)),
+        )
+
+        deltas = {}
+        for _, project_id, task_status, _ in rows:
+            deltas[(project_id, task_status)] = (
+                deltas.get((project_id, task_status), 0) - 1
+            )
+        apply_counter_deltas(deltas)
+        TaskTombstone.objects.bulk_create(
+            [
+                TaskTombstone(
+                    task_id=task_id,
+                    project_id=project_id,
+                    assigned_to_id=assigned_to_id,
+                )
+                for task_id, project_id, _, assigned_to_id in rows
+            ]
+        )
+        bump_task_versions(*(row[1] for row in rows))
+    return len(rows)
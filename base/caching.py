@@ -0,0 +1,108 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def version_key(namespace, object_id):
+    return f"{namespace}:version:{object_id}"
+
+
+def _new_version():
+    # Versions start from the clock so an evicted counter never repeats an
+    # old value and resurrects entries cached under it.
+    return int(time.time() * 1000)
+
+
+def _version_timeout():
+    # Finite, so keys created for ids that do not exist (e.g. probed
+    # /projects/<pk>/ urls) do not pile up; an expired counter restarts
+    # from the clock like an evicted one
+    return getattr(settings, "READ_CACHE_VERSION_TIMEOUT", 60 * 60 * 24)
+
+
+def get_version(namespace, object_id):
+    key = version_key(namespace, object_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), timeout=_version_timeout())
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace, *object_ids):
+    """
+    Invalidate every cached entry of the given objects in O(1) per object
+    """
+    # Bump after commit, otherwise a concurrent reader could cache the old
+    # rows under the new version.
+    transaction.on_commit(lambda: _bump_version(namespace, object_ids))
+
+
+def bump_task_versions(*project_ids):
+    """
+    Invalidate the cached detail of the given projects and the validators
+    of every task listing after their tasks were written
+    """
+    bump_version("project", *project_ids)
+    bump_version("tasks", "all")
+
+
+def _bump_version(namespace, object_ids):
+    for object_id in set(object_ids):
+        if object_id is None:
+            continue
+        key = version_key(namespace, object_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), timeout=_version_timeout())
+
+
+def request_variant(request):
+    return hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+
+
+def get_or_build(namespace, object_id, variant, build, timeout=None):
+    """
+    Versioned read-through cache with stampede protection; returns
+    ``(data, version)`` with the version the data was built at.
+
+    On a miss only the worker holding a short lock rebuilds the entry; the
+    others serve the last built value if there is one, or wait briefly for
+    the rebuild before building it themselves.
+    """
+    if timeout is None:
+        timeout = getattr(settings, "READ_CACHE_TIMEOUT", 300)
+    version = get_version(namespace, object_id)
+    key = f"{namespace}:{object_id}:{version}:{variant}"
+    data = cache.get(key)
+    if data is not None:
+        return data, version
+
+    stale_key = f"{namespace}:stale:{object_id}:{variant}"
+    lock_key = f"{key}:lock"
+    lock_timeout = getattr(settings, "READ_CACHE_LOCK_TIMEOUT", 10)
+    if cache.add(lock_key, 1, timeout=lock_timeout):
+        try:
+            data = build()
+            cache.set(key, data, timeout=timeout)
+            cache.set(stale_key, (version, data), timeout=timeout * 2)
+        finally:
+            cache.delete(lock_key)
+        return data, version
+
+    # The stale entry keeps the version it was built at, so callers never
+    # label old data with the current version
+    stale = cache.get(stale_key)
+    if stale is not None:
+        stale_version, data = stale
+        return data, stale_version
+
+    for _ in range(getattr(settings, "READ_CACHE_WAIT_RETRIES", 20)):
+        time.sleep(0.05)
+        data = cache.get(key)
+        if data is not None:
+            return data, version
+    return build(), version
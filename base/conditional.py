@@ -0,0 +1,45 @@
+import hashlib
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from .caching import get_version
+
+
+def make_etag(*parts):
+    digest = hashlib.md5("|".join(str(part) for part in parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+def set_validators(response, etag):
+    response["ETag"] = etag
+    # Listings are scoped to the caller, so caches must key on the token
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+class ConditionalListMixin:
+    """
+    Answers list requests with ``304 Not Modified`` when nothing changed.
+
+    The ETag hashes the ``tasks`` version counter, bumped after every task
+    write (see ``base.caching.bump_task_versions``), with the caller's scope
+    and the requested URL, so checking it costs one cache read and no query.
+    No ``Last-Modified`` is sent: it cannot be known without aggregating the
+    listing.
+    """
+
+    def list(self, request, *args, **kwargs):
+        user = request.user
+        etag = make_etag(
+            get_version("tasks", "all"),
+            user.id,
+            user.role,
+            request.build_absolute_uri(),
+            request.accepted_media_type,
+        )
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        # The same listing may be rendered as JSON or MessagePack
+        patch_vary_headers(response, ["Accept"])
+        return set_validators(response, etag)
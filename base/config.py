@@ -0,0 +1,90 @@
+import threading
+import time
+from django.conf import settings
+from .caching import bump_version, get_version
+from .models import TaskConfigurations
+
+
+CONFIG_NAMESPACE = "task_config"
+TRUE_VALUES = {"1", "true", "yes", "on"}
+
+
+def _to_bool(value):
+    return value.strip().lower() in TRUE_VALUES
+
+
+class ConfigRegistry:
+    """
+    In-process snapshot of the active ``TaskConfigurations`` rows.
+
+    Reads never query the database: at most every ``check_interval`` seconds
+    the snapshot compares its version with a Redis version key, bumped
+    whenever a configuration is saved or deleted, and reloads all rows in
+    one query when it changed.
+    """
+
+    def __init__(self, check_interval=None):
+        self.check_interval = check_interval
+        self._values = None
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_check_interval(self):
+        if self.check_interval is not None:
+            return self.check_interval
+        return getattr(settings, "CONFIG_REGISTRY_CHECK_INTERVAL", 5)
+
+    def snapshot(self):
+        """
+        Return ``{config_name: raw value}``; later rows win for a name
+        """
+        now = time.monotonic()
+        interval = self.get_check_interval()
+        if self._values is not None and now - self._checked_at < interval:
+            return self._values
+        with self._lock:
+            if self._values is None or now - self._checked_at >= interval:
+                # Read the version first, so a change racing the reload is
+                # picked up again on the next check
+                version = get_version(CONFIG_NAMESPACE, "all")
+                if self._values is None or version != self._version:
+                    self._values = dict(
+                        TaskConfigurations.objects.filter(status=True)
+                        .order_by("created_at", "id")
+                        .values_list("config_name", "config_value")
+                    )
+                    self._version = version
+                self._checked_at = now
+            return self._values
+
+    def get(self, name, cast=str, default=None):
+        value = self.snapshot().get(name)
+        if value is None:
+            return default
+        try:
+            return _to_bool(value) if cast is bool else cast(value)
+        except (TypeError, ValueError):
+            return default
+
+    def invalidate(self):
+        """
+        Make every process reload its snapshot on its next check
+        """
+        bump_version(CONFIG_NAMESPACE, "all")
+
+    def clear(self):
+        with self._lock:
+            self._values = None
+            self._version = None
+
+
+registry = ConfigRegistry()
+
+
+def get_config(name, cast=str, default=None):
+    """
+    Typed read of an active configuration, e.g.
+    ``get_config("task_expiry", int, default=2)``
+    """
+    return registry.get(name, cast, default)
@@ -0,0 +1,65 @@
+from collections import Counter
+from django.db.models import Count, F
+from .models import Project
+
+
+# Task status -> Project counter column kept in sync with it
+STATUS_COUNTER_FIELDS = {
+    "Pending": "pending_tasks",
+    "In Progress": "in_progress_tasks",
+    "Pending Approval": "pending_approval_tasks",
+    "Approved": "approved_tasks",
+    "Completed": "completed_tasks",
+}
+COUNTER_FIELDS = ["total_tasks", *STATUS_COUNTER_FIELDS.values()]
+
+
+def apply_counter_deltas(deltas):
+    """
+    Apply ``{(project_id, status): delta}`` to the project counters.
+
+    Each project is updated with a single ``UPDATE ... SET x = x + n`` so
+    concurrent writers never lose increments.
+    """
+    per_project = {}
+    for (project_id, task_status), delta in deltas.items():
+        if not delta or project_id is None:
+            continue
+        changes = per_project.setdefault(project_id, Counter())
+        changes["total_tasks"] += delta
+        field = STATUS_COUNTER_FIELDS.get(task_status)
+        if field:
+            changes[field] += delta
+
+    for project_id, changes in per_project.items():
+        updates = {
+            field: F(field) + delta for field, delta in changes.items() if delta
+        }
+        if updates:
+            Project.objects.filter(pk=project_id).update(**updates)
+
+
+def count_tasks(queryset):
+    """
+    Return ``{(project_id, status): count}`` for a task queryset
+    """
+    rows = (
+        queryset.order_by()
+        .values("project_id", "status")
+        .annotate(count=Count("id"))
+    )
+    return {(row["project_id"], row["status"]): row["count"] for row in rows}
+
+
+def expected_counters(task_counts):
+    """
+    Fold ``count_tasks`` output into ``{project_id: {counter_field: value}}``
+    """
+    counters = {}
+    for (project_id, task_status), count in task_counts.items():
+        values = counters.setdefault(project_id, dict.fromkeys(COUNTER_FIELDS, 0))
+        values["total_tasks"] += count
+        field = STATUS_COUNTER_FIELDS.get(task_status)
+        if field:
+            values[field] += count
+    return counters
@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+import zlib
+from django.conf import settings
+from main.renderers import msgpack, msgpack_packer, to_columns
+
+
+# (output column, queryset lookup); related names are read through JOINs in
+# the same values_list query, so no model instances are built.
+EXPORT_COLUMNS = [
+    ("id", "id"),
+    ("title", "title"),
+    ("description", "description"),
+    ("status", "status"),
+    ("priority", "priority"),
+    ("due_date", "due_date"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+    ("project_id", "project_id"),
+    ("project_name", "project__name"),
+    ("assigned_to_id", "assigned_to_id"),
+    ("assigned_to_username", "assigned_to__username"),
+    ("created_by_id", "created_by_id"),
+]
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+if msgpack is not None:
+    EXPORT_FORMATS.update(
+        {
+            "msgpack": ("application/msgpack", "msgpack"),
+            "msgpack-columnar": ("application/x-msgpack-columnar", "msgpack"),
+        }
+    )
+# Low-cardinality columns dictionary-encoded in columnar exports
+DICTIONARY_COLUMNS = ("status", "priority")
+
+# Rows are buffered into chunks of roughly this many bytes before being sent
+BUFFER_SIZE = 64 * 1024
+
+
+def _encode(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def iter_rows(queryset, chunk_size=None):
+    if chunk_size is None:
+        chunk_size = getattr(settings, "TASK_EXPORT_CHUNK_SIZE", 2000)
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    return queryset.order_by("id").values_list(*lookups).iterator(chunk_size=chunk_size)
+
+
+def csv_chunks(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column for column, _ in EXPORT_COLUMNS])
+    # The header goes out before the query runs
+    yield buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for row in rows:
+        writer.writerow([_encode(value) for value in row])
+        if buffer.tell() >= BUFFER_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def ndjson_chunks(rows):
+    columns = [column for column, _ in EXPORT_COLUMNS]
+    lines, size = [], 0
+    for row in rows:
+        line = json.dumps(dict(zip(columns, row)), default=_encode) + "\n"
+        lines.append(line)
+        size += len(line)
+        if size >= BUFFER_SIZE:
+            yield "".join(lines).encode()
+            lines, size = [], 0
+    if lines:
+        yield "".join(lines).encode()
+
+
+def msgpack_chunks(rows):
+    """
+    One MessagePack map per row, back to back (the binary twin of NDJSON)
+    """
+    packer = msgpack_packer()
+    columns = [column for column, _ in EXPORT_COLUMNS]
+    buffer = bytearray()
+    for row in rows:
+        buffer += packer.pack(dict(zip(columns, row)))
+        if len(buffer) >= BUFFER_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def columnar_chunks(rows, block_size):
+    """
+    Back-to-back columnar MessagePack blocks (see ``to_columns``) of up to
+    ``block_size`` rows each, so memory stays bounded
+    """
+    packer = msgpack_packer()
+    columns = [column for column, _ in EXPORT_COLUMNS]
+    block = []
+    for row in rows:
+        block.append(row)
+        if len(block) >= block_size:
+            yield packer.pack(to_columns(block, columns, DICTIONARY_COLUMNS))
+            block = []
+    if block:
+        yield packer.pack(to_columns(block, columns, DICTIONARY_COLUMNS))
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_chunks(queryset, output="csv", compress=False, chunk_size=None):
+    """
+    Stream a task export as byte chunks with constant memory use
+    """
+    if chunk_size is None:
+        chunk_size = getattr(settings, "TASK_EXPORT_CHUNK_SIZE", 2000)
+    rows = iter_rows(queryset, chunk_size)
+    if output == "csv":
+        chunks = csv_chunks(rows)
+    elif output == "msgpack":
+        chunks = msgpack_chunks(rows)
+    elif output == "msgpack-columnar":
+        chunks = columnar_chunks(rows, chunk_size)
+    else:
+        chunks = ndjson_chunks(rows)
+    return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,26 @@
+from django_filters import rest_framework as filters
+from .models import PRIORITY_RANKS, Task
+
+
+class TaskFilter(filters.FilterSet):
+    """
+    ``?priority=`` filters on ``priority_rank``, which leads an index, rather
+    than on the unindexed ``priority`` text column
+    """
+
+    priority = filters.ChoiceFilter(
+        choices=Task.PRIORITY_CHOICES, method="filter_priority"
+    )
+
+    class Meta:
+        model = Task
+        fields = ["priority", "status", "due_date"]
+
+    def filter_priority(self, queryset, name, value):
+        return queryset.filter(priority_rank=PRIORITY_RANKS[value])
+
+
+class TaskExportFilter(TaskFilter):
+    class Meta:
+        model = Task
+        fields = ["priority", "status", "project", "assigned_to"]
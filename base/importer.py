@@ -0,0 +1,110 @@
+import csv
+import itertools
+import json
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .models import ImportCheckpoint, Task
+
+
+PRIORITIES = dict(Task.PRIORITY_CHOICES)
+STATUSES = dict(Task.STATUS_CHOICES)
+
+
+def read_records(path, file_format):
+    """
+    Yield raw records: dicts for CSV, undecoded lines for NDJSON
+    """
+    with open(path, newline="", encoding="utf-8") as stream:
+        if file_format == "csv":
+            yield from csv.DictReader(stream)
+        else:
+            for line in stream:
+                if line.strip():
+                    yield line
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _text(record, key, required=True, default=""):
+    value = record.get(key)
+    if value in (None, ""):
+        if required:
+            raise ValueError(f"'{key}' is required")
+        return default
+    return str(value)
+
+
+def _datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"invalid datetime {value!r}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def parse_record(kind, record):
+    """
+    Normalize one raw record, returning ``(data, None)`` or ``(None, error)``.
+
+    Runs in the parse workers, so it must not touch the database.
+    """
+    try:
+        if isinstance(record, str):
+            record = json.loads(record)
+        label = "name" if kind == "projects" else "title"
+        data = {
+            label: _text(record, label),
+            "description": _text(record, "description", required=False),
+            "created_by": _text(record, "created_by", required=False, default=None),
+        }
+        if kind == "projects":
+            return data, None
+
+        data["due_date"] = _datetime(_text(record, "due_date"))
+        data["priority"] = _text(record, "priority", required=False, default="Medium")
+        data["status"] = _text(record, "status", required=False, default="Pending")
+        if data["priority"] not in PRIORITIES:
+            raise ValueError(f"invalid priority {data['priority']!r}")
+        if data["status"] not in STATUSES:
+            raise ValueError(f"invalid status {data['status']!r}")
+        data["project_id"] = record.get("project_id") or None
+        data["project_name"] = record.get("project_name") or None
+        if data["project_id"] is None and data["project_name"] is None:
+            raise ValueError("'project_id' or 'project_name' is required")
+        if data["project_id"] is not None:
+            data["project_id"] = int(data["project_id"])
+        data["assigned_to"] = record.get("assigned_to") or None
+        return data, None
+    except (ValueError, TypeError, AttributeError) as exc:
+        return None, str(exc)
+
+
+def parse_batch(kind, records):
+    return [parse_record(kind, record) for record in records]
+
+
+def load_checkpoint(name, source, kind):
+    if not name:
+        return 0
+    records = (
+        ImportCheckpoint.objects.filter(name=name, source=source, kind=kind)
+        .values_list("records", flat=True)
+        .first()
+    )
+    return records or 0
+
+
+def save_checkpoint(name, source, kind, records):
+    """
+    Record progress; call in the transaction that wrote the records
+    """
+    if not name:
+        return
+    ImportCheckpoint.objects.update_or_create(
+        name=name, defaults={"source": source, "kind": kind, "records": records}
+    )
@@ -0,0 +1,33 @@
+import sys
+from django.core.management.base import BaseCommand
+from base.export import EXPORT_FORMATS, export_chunks
+from base.models import Task
+
+
+class Command(BaseCommand):
+    help = "Streams all tasks as CSV, NDJSON or MessagePack, optionally gzip-compressed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument(
+            "--output", help="File to write to; defaults to standard output."
+        )
+        parser.add_argument("--chunk-size", type=int)
+
+    def handle(self, *args, **options):
+        chunks = export_chunks(
+            Task.objects.all(),
+            output=options["format"],
+            compress=options["gzip"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"]:
+            with open(options["output"], "wb") as stream:
+                for chunk in chunks:
+                    stream.write(chunk)
+            self.stderr.write(f"Tasks exported to {options['output']}.")
+        else:
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
@@ -0,0 +1,173 @@
+import functools
+import itertools
+import multiprocessing
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from account.models import UserProfile
+from base.caching import bump_task_versions
+from base.counters import apply_counter_deltas
+from base.importer import (
+    batched,
+    load_checkpoint,
+    parse_batch,
+    read_records,
+    save_checkpoint,
+)
+from base.models import Project, Task
+
+
+class Command(BaseCommand):
+    help = "Bulk imports projects or tasks from a CSV or NDJSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--kind", choices=["projects", "tasks"], default="tasks")
+        parser.add_argument("--format", choices=["csv", "ndjson"])
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=0,
+            help="Parse records in this many worker processes.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "Name under which progress is stored in the database; an "
+                "interrupted import run with the same name resumes from it."
+            ),
+        )
+        parser.add_argument(
+            "--created-by",
+            help="Username used for records without a created_by column.",
+        )
+
+    def handle(self, *args, **options):
+        path, kind = options["path"], options["kind"]
+        file_format = options["format"] or (
+            "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+        )
+        source = os.path.abspath(path)
+
+        # Every username and project is resolved from one preloaded mapping
+        self.users = dict(UserProfile.objects.values_list("username", "id"))
+        self.projects = dict(Project.objects.values_list("name", "id"))
+        self.project_ids = set(self.projects.values())
+        self.default_creator = None
+        if options["created_by"]:
+            self.default_creator = self.users.get(options["created_by"])
+            if self.default_creator is None:
+                raise CommandError(f"Unknown user {options['created_by']!r}.")
+
+        done = load_checkpoint(options["checkpoint"], source, kind)
+        if done:
+            self.stdout.write(f"Resuming after {done} records.")
+        records = itertools.islice(read_records(path, file_format), done, None)
+        batches = batched(records, options["batch_size"])
+        parse = functools.partial(parse_batch, kind)
+
+        pool = multiprocessing.Pool(options["workers"]) if options["workers"] else None
+        parsed_batches = pool.imap(parse, batches) if pool else map(parse, batches)
+
+        imported = skipped = 0
+        started = time.monotonic()
+        try:
+            for parsed in parsed_batches:
+                objects = []
+                for offset, (data, error) in enumerate(parsed):
+                    if data is not None:
+                        obj, error = self.build(kind, data)
+                    if error:
+                        skipped += 1
+                        self.stderr.write(f"Record {done + offset + 1}: {error}")
+                    else:
+                        objects.append(obj)
+
+                # Rows and progress commit together, so a crash in between
+                # can neither lose nor duplicate the batch on resume
+                with transaction.atomic():
+                    self.write(kind, objects, options["batch_size"])
+                    save_checkpoint(
+                        options["checkpoint"], source, kind, done + len(parsed)
+                    )
+                imported += len(objects)
+                done += len(parsed)
+
+                rate = imported / max(time.monotonic() - started, 1e-9)
+                self.stdout.write(f"{imported} {kind} imported ({rate:.0f} rows/sec)")
+        finally:
+            if pool:
+                pool.close()
+                pool.join()
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            f"{imported} {kind} imported, {skipped} skipped in {elapsed:.1f}s "
+            f"({imported / max(elapsed, 1e-9):.0f} rows/sec)."
+        )
+
+    def build(self, kind, data):
+        created_by = self.default_creator
+        if data["created_by"] is not None:
+            created_by = self.users.get(data["created_by"])
+            if created_by is None:
+                return None, f"unknown user {data['created_by']!r}"
+        if created_by is None:
+            return None, "'created_by' is required"
+
+        if kind == "projects":
+            return (
+                Project(
+                    name=data["name"],
+                    description=data["description"],
+                    created_by_id=created_by,
+                ),
+                None,
+            )
+
+        project_id = data["project_id"]
+        if project_id is None:
+            project_id = self.projects.get(data["project_name"])
+        if project_id not in self.project_ids:
+            return None, "unknown project"
+        assigned_to = None
+        if data["assigned_to"] is not None:
+            assigned_to = self.users.get(data["assigned_to"])
+            if assigned_to is None:
+                return None, f"unknown user {data['assigned_to']!r}"
+
+        return (
+            Task(
+                title=data["title"],
+                description=data["description"],
+                due_date=data["due_date"],
+                priority=data["priority"],
+                status=data["status"],
+                project_id=project_id,
+                assigned_to_id=assigned_to,
+                created_by_id=created_by,
+            ),
+            None,
+        )
+
+    def write(self, kind, objects, batch_size):
+        if not objects:
+            return
+        with transaction.atomic():
+            if kind == "projects":
+                Project.objects.bulk_create(objects, batch_size=batch_size)
+                for project in objects:
+                    self.projects.setdefault(project.name, project.id)
+                    self.project_ids.add(project.id)
+                return
+
+            Task.objects.bulk_create(objects, batch_size=batch_size)
+            # bulk_create skips model signals, so maintain counters here
+            deltas = {}
+            for task in objects:
+                key = (task.project_id, task.status)
+                deltas[key] = deltas.get(key, 0) + 1
+            apply_counter_deltas(deltas)
+            bump_task_versions(*(project_id for project_id, _ in deltas))
@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from base.caching import bump_version
+from base.counters import COUNTER_FIELDS, count_tasks, expected_counters
+from base.models import Project, Task
+
+
+class Command(BaseCommand):
+    help = "Rebuilds (or only verifies) the denormalized per-project task counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Report drifted projects without fixing them.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        # One grouped count finds the candidates; each one is recounted
+        # under its row lock before being written
+        expected = expected_counters(count_tasks(Task.objects.all()))
+        empty = dict.fromkeys(COUNTER_FIELDS, 0)
+
+        drifted = []
+        for project in Project.objects.only("id", *COUNTER_FIELDS).iterator(
+            chunk_size=options["batch_size"]
+        ):
+            values = expected.get(project.id, empty)
+            if any(getattr(project, field) != values[field] for field in values):
+                drifted.append(project.id)
+
+        if options["verify"]:
+            for project_id in drifted:
+                self.stdout.write(f"Project {project_id} counters are out of date.")
+            self.stdout.write(f"{len(drifted)} projects with drifted counters.")
+            return
+
+        rebuilt = sum(self.rebuild(project_id) for project_id in drifted)
+        self.stdout.write(f"{rebuilt} project counters rebuilt successfully.")
+
+    def rebuild(self, project_id):
+        """
+        Recount one project's tasks and write its counters in a short
+        transaction holding the project row lock.
+
+        Task writes adjust the counters with F() increments in their own
+        transaction, so a write the recount cannot see yet waits for the
+        lock and applies on top of it instead of being overwritten.
+        """
+        with transaction.atomic():
+            project = (
+                Project.objects.select_for_update()
+                .only("id", *COUNTER_FIELDS)
+                .filter(pk=project_id)
+                .first()
+            )
+            if project is None:
+                return False
+            values = expected_counters(
+                count_tasks(Task.objects.filter(project_id=project_id))
+            ).get(project_id, dict.fromkeys(COUNTER_FIELDS, 0))
+            if all(getattr(project, field) == values[field] for field in values):
+                return False
+            Project.objects.filter(pk=project_id).update(**values)
+            # update() skips the signals that invalidate cached project detail
+            bump_version("project", project_id)
+        return True
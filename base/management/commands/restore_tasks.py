@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from base.archive import restore_tasks
+from base.models import ArchivedTask
+
+
+class Command(BaseCommand):
+    help = "Moves archived tasks back into the live task table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("ids", nargs="*", type=int, help="Archived task ids.")
+        parser.add_argument(
+            "--project", type=int, help="Restore every archived task of a project."
+        )
+        parser.add_argument("--batch-size", type=int)
+
+    def handle(self, *args, **options):
+        if not options["ids"] and options["project"] is None:
+            raise CommandError("Pass archived task ids and/or --project.")
+
+        queryset = ArchivedTask.objects.all()
+        if options["ids"]:
+            queryset = queryset.filter(id__in=options["ids"])
+        if options["project"] is not None:
+            queryset = queryset.filter(project_id=options["project"])
+
+        restored, skipped = restore_tasks(queryset, batch_size=options["batch_size"])
+        if skipped:
+            self.stderr.write(
+                f"{skipped} tasks left archived: their project or creator "
+                "no longer exists."
+            )
+        self.stdout.write(f"{restored} tasks restored successfully.")
@@ -1,21 +1,53 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils.timezone import now, timedelta
-from base.models import Task
+from base.retention import (
+    delete_expired_tasks,
+    expired_tasks,
+    format_report,
+    get_retention_days,
+)
 
 
 class Command(BaseCommand):
-    help = "Deletes completed tasks older than a configurable period"
+    help = (
+        "Archives (or deletes) completed tasks older than a configurable period"
+    )
 
-    def handle(self, *args, **kwargs):
-        # Set the deletion period (configurable in settings)
-        from django.conf import settings
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Retention window; defaults to the task_expiry configuration.",
+        )
+        parser.add_argument("--chunk-size", type=int)
+        parser.add_argument(
+            "--sleep", type=float, help="Seconds to pause between chunks."
+        )
+        parser.add_argument(
+            "--purge",
+            action="store_true",
+            help="Delete the tasks without copying them to the archive.",
+        )
 
-        days = getattr(settings, "TASK_DELETION_DAYS", 2)
-        deletion_time = now() - timedelta(days=days)
+    def handle(self, *args, **options):
+        days = options["days"]
+        if days is None:
+            days = get_retention_days()
 
-        # Delete tasks that meet the criteria
-        tasks_deleted, _ = Task.objects.filter(
-            status="Completed", updated_at__lt=deletion_time
-        ).delete()
+        archive = not options["purge"] and getattr(
+            settings, "TASK_ARCHIVE_COMPLETED", False
+        )
+        action = "archived" if archive else "deleted"
 
-        self.stdout.write(f"{tasks_deleted} tasks deleted successfully.")
+        def progress(report):
+            if options["verbosity"] > 1:
+                self.stdout.write(format_report(report, action))
+
+        report = delete_expired_tasks(
+            expired_tasks(days),
+            chunk_size=options["chunk_size"],
+            sleep=options["sleep"],
+            progress=progress,
+            archive=archive,
+        )
+        self.stdout.write(format_report(report, action))
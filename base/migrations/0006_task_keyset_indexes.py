@@ -0,0 +1,22 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0005_taskconfigurations"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["due_date", "id"], name="task_due_date_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["created_at", "id"], name="task_created_at_id_idx"
+            ),
+        ),
+    ]
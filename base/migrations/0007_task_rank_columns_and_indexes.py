@@ -0,0 +1,88 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0006_task_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="task",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("Pending", "Pending"),
+                    ("In Progress", "In Progress"),
+                    ("Completed", "Completed"),
+                    ("Pending Approval", "Pending Approval"),
+                    ("Approved", "Approved"),
+                ],
+                default="Pending",
+                max_length=20,
+            ),
+        ),
+        # Generated columns are computed for existing rows when added, so no
+        # separate data migration is needed.
+        migrations.AddField(
+            model_name="task",
+            name="priority_rank",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(priority="Low", then=models.Value(1)),
+                    models.When(priority="Medium", then=models.Value(2)),
+                    models.When(priority="High", then=models.Value(3)),
+                    default=models.Value(0),
+                ),
+                output_field=models.PositiveSmallIntegerField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="status_rank",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(status="Pending", then=models.Value(1)),
+                    models.When(status="In Progress", then=models.Value(2)),
+                    models.When(status="Pending Approval", then=models.Value(3)),
+                    models.When(status="Approved", then=models.Value(4)),
+                    models.When(status="Completed", then=models.Value(5)),
+                    default=models.Value(0),
+                ),
+                output_field=models.PositiveSmallIntegerField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["priority_rank", "id"], name="task_priority_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["status_rank", "id"], name="task_status_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["assigned_to", "status", "due_date"],
+                name="task_assignee_status_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["project", "status"], name="task_project_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "created_at"], name="task_status_created_idx"
+            ),
+        ),
+    ]
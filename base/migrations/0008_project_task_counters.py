@@ -0,0 +1,72 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:41
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+STATUS_COUNTER_FIELDS = {
+    "Pending": "pending_tasks",
+    "In Progress": "in_progress_tasks",
+    "Pending Approval": "pending_approval_tasks",
+    "Approved": "approved_tasks",
+    "Completed": "completed_tasks",
+}
+
+
+def populate_counters(apps, schema_editor):
+    Project = apps.get_model("base", "Project")
+    Task = apps.get_model("base", "Task")
+
+    counters = {}
+    rows = Task.objects.order_by().values("project_id", "status").annotate(
+        count=Count("id")
+    )
+    for row in rows:
+        values = counters.setdefault(row["project_id"], {"total_tasks": 0})
+        values["total_tasks"] += row["count"]
+        field = STATUS_COUNTER_FIELDS.get(row["status"])
+        if field:
+            values[field] = values.get(field, 0) + row["count"]
+
+    for project_id, values in counters.items():
+        Project.objects.filter(pk=project_id).update(**values)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0007_task_rank_columns_and_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="total_tasks",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="pending_tasks",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="in_progress_tasks",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="pending_approval_tasks",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="approved_tasks",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="completed_tasks",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
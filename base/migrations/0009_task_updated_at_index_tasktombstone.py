@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-18 11:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0008_project_task_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["updated_at", "id"], name="task_updated_at_id_idx"
+            ),
+        ),
+        migrations.CreateModel(
+            name="TaskTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("task_id", models.BigIntegerField()),
+                ("project_id", models.BigIntegerField()),
+                ("assigned_to_id", models.BigIntegerField(null=True)),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+    ]
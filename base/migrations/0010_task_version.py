@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 15:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0009_task_updated_at_index_tasktombstone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.5 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0010_task_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedTask",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("title", models.CharField(max_length=100)),
+                ("description", models.TextField()),
+                ("due_date", models.DateTimeField()),
+                ("priority", models.CharField(max_length=10)),
+                ("status", models.CharField(max_length=20)),
+                ("project_id", models.BigIntegerField()),
+                ("assigned_to_id", models.BigIntegerField(null=True)),
+                ("created_by_id", models.BigIntegerField()),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["project_id", "id"], name="archivedtask_project_idx"
+                    ),
+                    models.Index(
+                        fields=["assigned_to_id", "id"],
+                        name="archivedtask_assignee_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
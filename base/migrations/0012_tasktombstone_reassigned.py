@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-18 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0011_archivedtask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tasktombstone",
+            name="reassigned",
+            field=models.BooleanField(default=False),
+        ),
+    ]
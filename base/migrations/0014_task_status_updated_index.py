@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("base", "0013_importcheckpoint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "updated_at"], name="task_status_updated_idx"
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from account.models import UserProfile
 
 
@@ -9,10 +10,51 @@ class Project(models.Model):
     created_by = models.ForeignKey(
         UserProfile, on_delete=models.CASCADE, related_name="created_projects"
     )
+    # Denormalized task counters, maintained by base.signals
+    total_tasks = models.PositiveIntegerField(default=0, editable=False)
+    pending_tasks = models.PositiveIntegerField(default=0, editable=False)
+    in_progress_tasks = models.PositiveIntegerField(default=0, editable=False)
+    pending_approval_tasks = models.PositiveIntegerField(default=0, editable=False)
+    approved_tasks = models.PositiveIntegerField(default=0, editable=False)
+    completed_tasks = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        from .counters import COUNTER_FIELDS
+
+        # Counters only change through F() increments; writing back this
+        # instance's copies would undo increments made since it was loaded
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+# Integer ranks giving task priorities and statuses a meaningful sort order
+PRIORITY_RANKS = {"Low": 1, "Medium": 2, "High": 3}
+STATUS_RANKS = {
+    "Pending": 1,
+    "In Progress": 2,
+    "Pending Approval": 3,
+    "Approved": 4,
+    "Completed": 5,
+}
+
+
+def rank_expression(field, ranks):
+    return models.Case(
+        *[
+            models.When(**{field: name}, then=models.Value(rank))
+            for name, rank in ranks.items()
+        ],
+        default=models.Value(0),
+    )
+
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -20,6 +62,7 @@ class Task(models.Model):
         ("In Progress", "In Progress"),
         ("Completed", "Completed"),
         ("Pending Approval", "Pending Approval"),
+        ("Approved", "Approved"),
     ]
 
     PRIORITY_CHOICES = [
@@ -44,11 +87,222 @@ class Task(models.Model):
         UserProfile, on_delete=models.CASCADE, related_name="created_tasks"
     )
     updated_at = models.DateTimeField(auto_now=True)
+    # Incremented by every write; clients send it back as ``If-Match``
+    version = models.PositiveIntegerField(default=1, editable=False)
+    # Computed by the database, so bulk updates can never leave them stale
+    priority_rank = models.GeneratedField(
+        expression=rank_expression("priority", PRIORITY_RANKS),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+    status_rank = models.GeneratedField(
+        expression=rank_expression("status", STATUS_RANKS),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        indexes = [
+            # Keyset pagination seeks (see base.pagination)
+            models.Index(fields=["due_date", "id"], name="task_due_date_id_idx"),
+            models.Index(fields=["created_at", "id"], name="task_created_at_id_idx"),
+            models.Index(fields=["priority_rank", "id"], name="task_priority_id_idx"),
+            models.Index(fields=["status_rank", "id"], name="task_status_id_idx"),
+            # Filtered listings
+            models.Index(
+                fields=["assigned_to", "status", "due_date"],
+                name="task_assignee_status_due_idx",
+            ),
+            models.Index(fields=["project", "status"], name="task_project_status_idx"),
+            models.Index(
+                fields=["status", "created_at"], name="task_status_created_idx"
+            ),
+            # Retention of completed tasks (see base.retention)
+            models.Index(
+                fields=["status", "updated_at"], name="task_status_updated_idx"
+            ),
+            # Incremental sync (see base.sync)
+            models.Index(fields=["updated_at", "id"], name="task_updated_at_id_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded counter keys so saves can adjust project counts
+        instance._loaded_counter_key = (
+            instance.__dict__.get("project_id"),
+            instance.__dict__.get("status"),
+        )
+        # ... and the assignee, so reassignments can be logged for sync
+        if "assigned_to_id" in instance.__dict__:
+            instance._loaded_assignee_id = instance.assigned_to_id
+        return instance
+
+    def save(self, *args, **kwargs):
+        updating = not self._state.adding
+        if updating:
+            # Incremented in SQL, so saving a stale instance still moves past
+            # every version a concurrent writer already handed out
+            self.version = models.F("version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        # The post_save counter adjustment commits with the row itself
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        if updating:
+            self.refresh_from_db(fields=["version"])
+
+    def conditional_update(self, conditions, **changes):
+        """
+        Write ``changes`` with a single ``UPDATE ... WHERE id = %s AND ...``
+        on ``conditions`` and return whether the row still matched them.
+
+        Only the changed columns are written. ``conditions`` should pin
+        ``status`` or ``version``, since the counters are adjusted from the
+        instance's own ``project_id`` and ``status``.
+        """
+        from .caching import bump_task_versions
+        from .counters import apply_counter_deltas
+
+        changes["updated_at"] = timezone.now()
+        with transaction.atomic():
+            updated = Task.objects.filter(pk=self.pk, **conditions).update(
+                version=models.F("version") + 1, **changes
+            )
+            if not updated:
+                return False
+
+            previous = (self.project_id, conditions.get("status", self.status))
+            previous_assignee_id = self.assigned_to_id
+            for field, value in changes.items():
+                setattr(self, field, value)
+            self.version = conditions.get("version", self.version) + 1
+            current = (self.project_id, self.status)
+            if previous != current:
+                apply_counter_deltas({previous: -1, current: 1})
+            TaskTombstone.record_reassignments(
+                [(self.pk, self.project_id, previous_assignee_id, self.assigned_to_id)]
+            )
+            self._loaded_counter_key = current
+            self._loaded_assignee_id = self.assigned_to_id
+            bump_task_versions(self.project_id, previous[0])
+        return True
+
+    def transition(self, from_status, to_status, **changes):
+        """
+        Move the task from ``from_status`` to ``to_status`` in one conditional
+        UPDATE; returns False, writing nothing, if it was not in ``from_status``
+        """
+        return self.conditional_update(
+            {"status": from_status}, status=to_status, **changes
+        )
+
+    @property
+    def etag(self):
+        return f'"{self.pk}-{self.version}"'
+
+    def __str__(self):
+        return self.title
+
+
+class TaskTombstone(models.Model):
+    """
+    Deletion log read by the incremental sync endpoint; rows are purged after
+    ``TASK_TOMBSTONE_RETENTION_DAYS``.
+
+    ``reassigned`` rows mark a task that left ``assigned_to_id``'s scope
+    without being deleted; only that user's sync reads them.
+    """
+
+    task_id = models.BigIntegerField()
+    project_id = models.BigIntegerField()
+    assigned_to_id = models.BigIntegerField(null=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    reassigned = models.BooleanField(default=False)
+
+    @classmethod
+    def record_reassignments(cls, reassignments):
+        """
+        Log ``(task_id, project_id, old_assignee_id, new_assignee_id)`` moves:
+        the old assignee gets a tombstone, and earlier ones of the new
+        assignee are dropped since the task is back in their scope
+        """
+        exits, returns = [], {}
+        for task_id, project_id, old_assignee_id, new_assignee_id in reassignments:
+            if old_assignee_id == new_assignee_id:
+                continue
+            if old_assignee_id is not None:
+                exits.append(
+                    cls(
+                        task_id=task_id,
+                        project_id=project_id,
+                        assigned_to_id=old_assignee_id,
+                        reassigned=True,
+                    )
+                )
+            if new_assignee_id is not None:
+                returns.setdefault(new_assignee_id, []).append(task_id)
+        for assignee_id, task_ids in returns.items():
+            cls.objects.filter(
+                task_id__in=task_ids, assigned_to_id=assignee_id, reassigned=True
+            ).delete()
+        cls.objects.bulk_create(exits)
+
+    def __str__(self):
+        return f"Task {self.task_id} deleted at {self.deleted_at}"
+
+
+class ArchivedTask(models.Model):
+    """
+    Cold copy of a completed task moved out of ``Task`` by the retention job.
+
+    Keeps the original id and a minimal column set with plain integer
+    references, so archived rows outlive their project or users and the
+    live table and its indexes stay small.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=100)
+    description = models.TextField()
+    due_date = models.DateTimeField()
+    priority = models.CharField(max_length=10)
+    status = models.CharField(max_length=20)
+    project_id = models.BigIntegerField()
+    assigned_to_id = models.BigIntegerField(null=True)
+    created_by_id = models.BigIntegerField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Archive lookups by project / assignee, paged on id
+            models.Index(fields=["project_id", "id"], name="archivedtask_project_idx"),
+            models.Index(
+                fields=["assigned_to_id", "id"], name="archivedtask_assignee_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class ImportCheckpoint(models.Model):
+    """
+    Progress of a named ``import_tasks`` run, written in the transaction of
+    each imported batch so a resumed run neither skips nor repeats records
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    source = models.TextField()
+    kind = models.CharField(max_length=20)
+    records = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.records} {self.kind}"
+
+
 class TaskConfigurations(models.Model):
     config_name = models.CharField(max_length=256)
     config_value = models.CharField(max_length=64)
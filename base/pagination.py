@@ -0,0 +1,203 @@
+import base64
+import binascii
+import json
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks on a composite key such as ``(due_date, id)``.
+
+    Pages are fetched with ``WHERE (due_date, id) > (...)`` style filters
+    instead of OFFSET, so page 10,000 costs the same index seek as page 1,
+    and no ``COUNT(*)`` is issued.
+    """
+
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    page_size_query_param = "page_size"
+    page_size = 50
+    max_page_size = 500
+    chunk_size = 500
+    invalid_cursor_message = "Invalid cursor"
+
+    # Public ordering name -> stable ordering ending in a unique column
+    orderings = {
+        "due_date": ("due_date", "id"),
+        "-due_date": ("-due_date", "-id"),
+        "created_at": ("created_at", "id"),
+        "-created_at": ("-created_at", "-id"),
+    }
+    default_ordering = "due_date"
+
+    def paginate_queryset(self, queryset, request, view=None, base_url=None):
+        queryset = self.get_page_queryset(queryset, request, base_url)
+        # Rows are streamed without filling the queryset's result cache
+        return self.paginate_rows(list(queryset.iterator(chunk_size=self.chunk_size)))
+
+    def get_page_queryset(self, queryset, request, base_url=None):
+        """
+        Return the lazy queryset of the requested page plus one lookahead row
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri(base_url)
+        self.page_size = self.get_page_size(request)
+
+        self.ordering_key = self.get_ordering_key(request)
+        ordering = self.orderings[self.ordering_key]
+        self.fields = [field.lstrip("-") for field in ordering]
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor["r"])
+        if self.reverse:
+            ordering = tuple(self.invert(field) for field in ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor:
+            try:
+                # Cursor values are checked against their fields' types here
+                queryset = queryset.filter(self.seek(ordering, self.cursor["v"]))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        return queryset[: self.page_size + 1]
+
+    def paginate_rows(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        self.rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.rows:
+            return None
+        return self.build_link(self.rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.rows:
+            return None
+        return self.build_link(self.rows[0], reverse=True)
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_ordering_fields(self, request):
+        """
+        Columns a page's rows must carry for the cursor links to be built
+        """
+        ordering = self.orderings[self.get_ordering_key(request)]
+        return [field.lstrip("-") for field in ordering]
+
+    def get_ordering_key(self, request):
+        key = request.query_params.get(self.ordering_query_param)
+        return key if key in self.orderings else self.default_ordering
+
+    def build_link(self, row, reverse):
+        values = [
+            self.encode_value(self.get_value(row, field)) for field in self.fields
+        ]
+        data = json.dumps({"v": values, "r": reverse}, separators=(",", ":"))
+        cursor = base64.urlsafe_b64encode(data.encode()).decode()
+        url = replace_query_param(self.base_url, self.cursor_query_param, cursor)
+        if self.ordering_key != self.default_ordering:
+            # Cursor values only make sense under the ordering they came from
+            url = replace_query_param(url, self.ordering_query_param, self.ordering_key)
+        return url
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if len(cursor["v"]) != len(self.fields):
+                raise ValueError
+            cursor["r"] = bool(cursor.get("r"))
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    @staticmethod
+    def get_value(row, field):
+        return row[field] if isinstance(row, dict) else getattr(row, field)
+
+    @staticmethod
+    def encode_value(value):
+        return value.isoformat() if hasattr(value, "isoformat") else value
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @classmethod
+    def seek(cls, ordering, values):
+        """
+        Build ``(a, b) > (x, y)`` as ``a >= x AND (a > x OR (a = x AND b > y))``
+
+        The leading range predicate lets the database seek the index on the
+        first column before checking the tie-breakers.
+        """
+        field, value = ordering[0], values[0]
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        strict = Q(**{f"{name}__{lookup}": value})
+        if len(ordering) == 1:
+            return strict
+        tie = Q(**{name: value}) & cls.seek(ordering[1:], values[1:])
+        return Q(**{f"{name}__{lookup}e": value}) & (strict | tie)
+
+
+class TaskPagination(KeysetPagination):
+    orderings = {
+        **KeysetPagination.orderings,
+        "priority": ("priority_rank", "id"),
+        "-priority": ("-priority_rank", "-id"),
+        "status": ("status_rank", "id"),
+        "-status": ("-status_rank", "-id"),
+    }
+    default_ordering = "due_date"
+
+
+class ArchivedTaskPagination(KeysetPagination):
+    orderings = {
+        "id": ("id",),
+        "-id": ("-id",),
+    }
+    default_ordering = "-id"
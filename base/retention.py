@@ -0,0 +1,105 @@
+import time
+from collections import namedtuple
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import pre_delete
+from django.utils import timezone
+from .archive import archive_task_batch
+from .bulk import delete_task_batch, iter_id_batches
+from .config import get_config
+from .models import Task
+
+
+# Progress of a retention run, reported after every chunk
+RetentionReport = namedtuple("RetentionReport", ["deleted", "chunks", "seconds"])
+
+
+def format_report(report, action="deleted"):
+    rate = report.deleted / report.seconds if report.seconds else 0
+    return (
+        f"{report.deleted} tasks {action} in {report.chunks} chunks "
+        f"({report.seconds:.1f}s, {rate:.0f} rows/s)."
+    )
+
+
+def get_retention_days():
+    """
+    Days completed tasks are kept: the ``task_expiry`` configuration, else
+    ``TASK_DELETION_DAYS``
+    """
+    return get_config(
+        "task_expiry", int, default=getattr(settings, "TASK_DELETION_DAYS", 2)
+    )
+
+
+def expired_tasks(days=None, now=None):
+    """
+    Tasks completed (last updated) more than ``days`` ago, read through the
+    ``(status, updated_at)`` index
+    """
+    if days is None:
+        days = get_retention_days()
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    return Task.objects.filter(status="Completed", updated_at__lte=cutoff)
+
+
+def can_raw_delete():
+    """
+    Whether ``delete_task_batch`` may skip the delete collector: nothing
+    listens to ``pre_delete`` for Task, and ``TASK_RAW_DELETE`` vouches that
+    base.signals owns the only ``post_delete`` receiver, whose work the
+    batch reproduces
+    """
+    if pre_delete.has_listeners(Task):
+        return False
+    return getattr(settings, "TASK_RAW_DELETE", True)
+
+
+def _collect_delete(queryset, batch):
+    with transaction.atomic():
+        _, deleted = queryset.filter(id__in=batch).delete()
+    return deleted.get(Task._meta.label, 0)
+
+
+def delete_expired_tasks(
+    queryset=None, chunk_size=None, sleep=None, progress=None, archive=None
+):
+    """
+    Delete expired completed tasks in primary-key ordered chunks, each in
+    its own short transaction, and return a ``RetentionReport``.
+
+    With ``archive`` (default ``TASK_ARCHIVE_COMPLETED``) each chunk is
+    copied into ``ArchivedTask`` in the same transaction before deletion.
+
+    ``sleep`` seconds are waited between chunks so other writers (notably on
+    SQLite) get the database in between; ``progress`` is called with the
+    running report after each chunk.
+    """
+    if queryset is None:
+        queryset = expired_tasks()
+    if chunk_size is None:
+        chunk_size = getattr(settings, "TASK_RETENTION_CHUNK_SIZE", 1000)
+    if sleep is None:
+        sleep = getattr(settings, "TASK_RETENTION_SLEEP", 0)
+    if archive is None:
+        archive = getattr(settings, "TASK_ARCHIVE_COMPLETED", False)
+    delete_batch = delete_task_batch if can_raw_delete() else _collect_delete
+
+    started = time.monotonic()
+    report = RetentionReport(deleted=0, chunks=0, seconds=0.0)
+    for batch in iter_id_batches(queryset, batch_size=chunk_size):
+        if report.chunks and sleep:
+            time.sleep(sleep)
+        with transaction.atomic():
+            if archive:
+                archive_task_batch(queryset, batch)
+            deleted = delete_batch(queryset, batch)
+        report = RetentionReport(
+            deleted=report.deleted + deleted,
+            chunks=report.chunks + 1,
+            seconds=time.monotonic() - started,
+        )
+        if progress is not None:
+            progress(report)
+    return report
@@ -1,17 +1,29 @@
-from rest_framework import serializers
-from .models import Task, Project
+from django.conf import settings
+from django.utils import timezone
+from django.utils.functional import cached_property
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+from account.models import UserProfile
+from .models import ArchivedTask, Task, Project
 from django.utils.timezone import now
 
 
 class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
-        fields = "__all__"
+        exclude = ["priority_rank", "status_rank"]
         read_only_fields = ["created_by"]
 
     def create(self, validated_data):
-        created_by = self.context["request"].user
-        return Task.objects.create(created_by=created_by, **validated_data)
+        created_by_id = self.context["request"].user.id
+        return Task.objects.create(created_by_id=created_by_id, **validated_data)
+
+    def update(self, instance, validated_data):
+        # Only the submitted columns are written
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
 
     def validate_due_date(self, value):
         if value <= now():
@@ -26,9 +38,166 @@ class TaskSerializer(serializers.ModelSerializer):
         return value
 
 
+class ValuesSerializer:
+    """
+    Read-only fast path producing the same dicts as ``serializer_class``
+    straight from ``.values()`` rows.
+
+    The field plan is compiled once; columns that are already in their
+    output form are copied as-is and only datetimes are converted. When the
+    active timezone is UTC even datetimes are left to the JSON renderer,
+    which emits the same ``...Z`` strings.
+    """
+
+    passthrough_fields = (
+        serializers.CharField,
+        serializers.ChoiceField,
+        serializers.IntegerField,
+        serializers.PrimaryKeyRelatedField,
+    )
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    @cached_property
+    def plan(self):
+        plan = []
+        for name, field in self.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.DateTimeField):
+                convert = self.datetime_converter(field)
+            elif isinstance(field, self.passthrough_fields):
+                convert = None
+            else:
+                raise TypeError(
+                    f"Field {name!r} ({type(field).__name__}) has no fast path."
+                )
+            plan.append((name, field.source, convert))
+        return plan
+
+    @cached_property
+    def native_plan(self):
+        return [
+            (name, source, None if getattr(convert, "utc_iso", False) else convert)
+            for name, source, convert in self.plan
+        ]
+
+    @property
+    def sources(self):
+        return [source for _, source, _ in self.plan]
+
+    def narrow(self, fields=None, exclude=None):
+        """
+        Return a copy emitting only ``fields`` and/or none of ``exclude``, so
+        the dropped columns are not selected either
+        """
+        names = [name for name, _, _ in self.plan]
+        unknown = set(fields or ()).union(exclude or ()).difference(names)
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": f"Unknown fields: {', '.join(sorted(unknown))}."}
+            )
+        narrowed = ValuesSerializer(self.serializer_class)
+        narrowed.plan = [
+            entry
+            for entry in self.plan
+            if (not fields or entry[0] in fields) and entry[0] not in (exclude or ())
+        ]
+        return narrowed
+
+    @staticmethod
+    def datetime_converter(field):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() != ISO_8601:
+            return field.to_representation
+
+        def convert(value):
+            value = field.enforce_timezone(value).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        # Without a field-level timezone the value is rendered in the active
+        # one, which the renderer reproduces natively when that is UTC
+        convert.utc_iso = not hasattr(field, "timezone")
+        return convert
+
+    @staticmethod
+    def native_datetimes():
+        return settings.USE_TZ and timezone.get_current_timezone_name() == "UTC"
+
+    def to_representation(self, row, plan=None):
+        data = {}
+        for name, source, convert in self.plan if plan is None else plan:
+            value = row[source]
+            data[name] = convert(value) if convert and value is not None else value
+        return data
+
+    def serialize(self, rows):
+        plan = self.native_plan if self.native_datetimes() else self.plan
+        return [self.to_representation(row, plan) for row in rows]
+
+
+task_values_serializer = ValuesSerializer(TaskSerializer)
+
+
+class ArchivedTaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedTask
+        fields = "__all__"
+
+
 class ProjectSerializer(serializers.ModelSerializer):
-    tasks = TaskSerializer(many=True, read_only=True)
+    tasks = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Project
+        fields = "__all__"
+
+    def get_tasks(self, project):
+        rows = project.tasks.values(*task_values_serializer.sources)
+        return task_values_serializer.serialize(rows)
+
 
+class ProjectSummarySerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
         fields = "__all__"
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves primary keys against ``{pk: object}`` maps preloaded into the
+    serializer context, so a batch of items needs no per-item queries.
+    """
+
+    def __init__(self, context_key, **kwargs):
+        self.context_key = context_key
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        obj = self.context[self.context_key].get(pk)
+        if obj is None:
+            self.fail("does_not_exist", pk_value=data)
+        return obj
+
+
+class BulkTaskSerializer(TaskSerializer):
+    project = PreloadedPrimaryKeyRelatedField(
+        "projects", queryset=Project.objects.all()
+    )
+    assigned_to = PreloadedPrimaryKeyRelatedField(
+        "users", queryset=UserProfile.objects.all(), allow_null=True, required=False
+    )
+
+    class Meta(TaskSerializer.Meta):
+        pass
+
+    def validate_project(self, value):
+        # Existence was already checked by the batch's single IN query
+        return value
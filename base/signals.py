@@ -0,0 +1,81 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from account.models import UserProfile
+from .caching import bump_task_versions, bump_version
+from .config import registry
+from .counters import apply_counter_deltas
+from .models import Project, Task, TaskConfigurations, TaskTombstone
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_counter_key(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    previous = getattr(instance, "_loaded_counter_key", (None, None))
+    assignee_id = getattr(instance, "_loaded_assignee_id", None)
+    if None in previous or not hasattr(instance, "_loaded_assignee_id"):
+        # Deferred or unsaved-state instance: read the stored values once
+        row = (
+            Task.objects.filter(pk=instance.pk)
+            .values_list("project_id", "status", "assigned_to_id")
+            .first()
+        )
+        previous, assignee_id = (row[:2], row[2]) if row else (None, None)
+    instance._previous_counter_key = previous
+    instance._previous_assignee_id = assignee_id
+
+
+@receiver(post_save, sender=Task)
+def update_project_counters_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    current = (instance.project_id, instance.status)
+    previous = None if created else getattr(instance, "_previous_counter_key", None)
+    if previous != current:
+        deltas = {current: 1}
+        if previous:
+            deltas[previous] = deltas.get(previous, 0) - 1
+        apply_counter_deltas(deltas)
+    if not created:
+        TaskTombstone.record_reassignments(
+            [
+                (
+                    instance.pk,
+                    instance.project_id,
+                    getattr(instance, "_previous_assignee_id", None),
+                    instance.assigned_to_id,
+                )
+            ]
+        )
+    instance._loaded_counter_key = current
+    instance._loaded_assignee_id = instance.assigned_to_id
+    bump_task_versions(instance.project_id, previous and previous[0])
+
+
+@receiver(post_delete, sender=Task)
+def update_project_counters_on_delete(sender, instance, **kwargs):
+    apply_counter_deltas({(instance.project_id, instance.status): -1})
+    bump_task_versions(instance.project_id)
+    TaskTombstone.objects.create(
+        task_id=instance.pk,
+        project_id=instance.project_id,
+        assigned_to_id=instance.assigned_to_id,
+    )
+
+
+@receiver(post_delete, sender=UserProfile)
+def invalidate_task_listings(sender, instance, **kwargs):
+    # Unassigning the user's tasks is an UPDATE that sends no Task signals
+    bump_version("tasks", "all")
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_cache(sender, instance, **kwargs):
+    bump_version("project", instance.pk)
+
+
+@receiver(post_save, sender=TaskConfigurations)
+@receiver(post_delete, sender=TaskConfigurations)
+def invalidate_config_registry(sender, instance, **kwargs):
+    registry.invalidate()
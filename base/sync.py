@@ -0,0 +1,101 @@
+import base64
+import binascii
+import json
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from .pagination import KeysetPagination
+
+
+class ResyncRequired(APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = (
+        "Sync cursor is older than the deletion log, a full resync is required."
+    )
+    default_code = "resync_required"
+
+
+def encode_cursor(task_position, tombstone_id, synced_at):
+    data = json.dumps(
+        {"t": task_position, "d": tombstone_id, "at": synced_at.isoformat()},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(encoded):
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        cursor["at"] = parse_datetime(cursor["at"])
+        if cursor["at"] is None or not isinstance(cursor["d"], int):
+            raise ValueError
+        if cursor["t"] is not None:
+            # The (updated_at, id) seek position of the last changed task
+            if not isinstance(cursor["t"], list) or len(cursor["t"]) != 2:
+                raise ValueError
+            updated_at, task_id = cursor["t"]
+            if parse_datetime(updated_at) is None or not isinstance(task_id, int):
+                raise ValueError
+    except (TypeError, ValueError, KeyError, binascii.Error):
+        raise ValidationError({"since": "Invalid sync cursor."})
+    return cursor
+
+
+def get_changes(tasks, tombstones, since=None, limit=500):
+    """
+    Return tasks changed and ids of tasks deleted after the ``since`` cursor.
+
+    Changed tasks are read through the ``(updated_at, id)`` index and
+    deletions through the tombstone primary key, so the cost follows the
+    number of changes rather than the size of the table.
+
+    Only rows stamped at least ``TASK_SYNC_SAFETY_LAG`` seconds ago are
+    returned: ``updated_at`` and tombstone ids are assigned before commit,
+    so a slow transaction can commit rows behind a cursor that already
+    moved past them. The lag must exceed the longest write transaction.
+    """
+    now = timezone.now()
+    horizon = now - timedelta(seconds=getattr(settings, "TASK_SYNC_SAFETY_LAG", 5))
+    tasks = tasks.filter(updated_at__lte=horizon)
+    tombstones = tombstones.filter(deleted_at__lte=horizon)
+    cursor = decode_cursor(since) if since else None
+    if cursor is None:
+        # A fresh client fetches every task; earlier deletions don't concern it
+        task_position = None
+        tombstone_id = tombstones.aggregate(last=Max("id"))["last"] or 0
+        tombstones = tombstones.none()
+    else:
+        retention = getattr(settings, "TASK_TOMBSTONE_RETENTION_DAYS", 30)
+        if cursor["at"] < now - timedelta(days=retention):
+            raise ResyncRequired()
+        task_position = cursor["t"]
+        tombstone_id = cursor["d"]
+        if task_position:
+            tasks = tasks.filter(
+                KeysetPagination.seek(("updated_at", "id"), task_position)
+            )
+        tombstones = tombstones.filter(id__gt=tombstone_id)
+
+    changed = list(tasks.order_by("updated_at", "id")[: limit + 1])
+    deleted = list(tombstones.order_by("id").values_list("id", "task_id")[: limit + 1])
+    has_more = len(changed) > limit or len(deleted) > limit
+    changed, deleted = changed[:limit], deleted[:limit]
+
+    if changed:
+        task_position = [changed[-1].updated_at.isoformat(), changed[-1].id]
+    if deleted:
+        tombstone_id = deleted[-1][0]
+    # While a client is still paging, unread tombstones date from its
+    # previous sync, so the retention check keeps using that time.
+    synced_at = cursor["at"] if cursor and has_more else now
+
+    return {
+        "changed": changed,
+        "deleted": [task_id for _, task_id in deleted],
+        "since": encode_cursor(task_position, tombstone_id, synced_at),
+        "has_more": has_more,
+    }
@@ -1,40 +1,49 @@
 from datetime import timedelta
 from celery import shared_task
 from django.core.cache import cache
-from .models import Task, TaskConfigurations
-import datetime
+from django.conf import settings
+from django.utils import timezone
+from .approvals import approval_queue
+from .bulk import update_tasks
+from .models import Task, TaskTombstone
+from .retention import delete_expired_tasks, format_report
 
 
-# tasks.py
 @shared_task
 def delete_old_completed_tasks():
-    deletion_time = TaskConfigurations.objects.filter(config_name="task_expiry").last()
-    deletion_time = int(deletion_time) if deletion_time else 2
-    deletion_time = datetime.now() - timedelta(days=deletion_time)
-    Task.objects.filter(created_at__lte=deletion_time, status="Completed").delete()
+    archive = getattr(settings, "TASK_ARCHIVE_COMPLETED", False)
+    report = delete_expired_tasks(archive=archive)
+    return format_report(report, "archived" if archive else "deleted")
+
+
+@shared_task
+def purge_task_tombstones():
+    days = getattr(settings, "TASK_TOMBSTONE_RETENTION_DAYS", 30)
+    deleted, _ = TaskTombstone.objects.filter(
+        deleted_at__lt=timezone.now() - timedelta(days=days)
+    ).delete()
+    return f"{deleted} task tombstones purged."
+
+
+@shared_task
+def sweep_due_approvals():
+    approved = approval_queue.sweep()
+    return f"{approved} tasks approved."
 
 
 @shared_task
 def save_task_to_db(task_id):
-    # Retrieve the task from Redis
-    task_data = cache.get(f"task:{task_id}")
-    if not task_data:
+    """
+    Countdown approvals queued before ``sweep_due_approvals`` replaced them
+    """
+    if not cache.get(f"task:{task_id}"):
         return f"Task {task_id} not found or approval revoked."
-
-    # Get the actual task object from the database
-    try:
-        task = Task.objects.get(id=task_id)
-    except Task.DoesNotExist:
-        return f"Task {task_id} not found in the database."
-
-    # Ensure the task is still approved
-    if task.status == "Pending Approval":
-        task.status = "Approved"
-        task.save()
-        # Remove the task from Redis after saving
-        cache.delete(f"task:{task_id}")
+    cache.delete(f"task:{task_id}")
+    approved = update_tasks(
+        Task.objects.filter(status="Pending Approval"),
+        {"status": "Approved"},
+        ids=[task_id],
+    )
+    if approved:
         return f"Task {task_id} approved and saved to the database."
-    else:
-        task.delete()  # Optionally delete the task if status is not pending
-        cache.delete(f"task:{task_id}")
-        return f"Task {task_id} was not approved and has been discarded."
+    return f"Task {task_id} is no longer pending approval."
@@ -1 +1,1063 @@
-# Create your tests here.
+import base64
+import csv
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import patch
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, IntegrityError, connection
+from django.db.models import F
+from django.db.models.signals import pre_delete
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+import fakeredis
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+from account.middleware import TimeBasedAccessMiddleware
+from account.models import UserProfile
+from account.serializers import RoleTokenObtainPairSerializer
+from main.renderers import FastJSONRenderer
+from . import bulk, views
+from .approvals import ApprovalQueue
+from .caching import get_version, version_key
+from .config import ConfigRegistry, get_config, registry
+from .counters import COUNTER_FIELDS, apply_counter_deltas
+from .management.commands import import_tasks, project_counters
+from .archive import ARCHIVE_FIELDS, restore_tasks
+from .models import (
+    ArchivedTask,
+    ImportCheckpoint,
+    Project,
+    Task,
+    TaskConfigurations,
+    TaskTombstone,
+)
+from .retention import can_raw_delete, delete_expired_tasks, expired_tasks
+
+
+TEST_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# EXPLAIN QUERY PLAN detail of a full table scan, e.g. "SCAN base_task"
+FULL_SCAN = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+
+
+@override_settings(CACHES=TEST_CACHES)
+class TaskAPITestCase(TestCase):
+    """
+    Admin, manager and user accounts with a project of tasks, plus an
+    authenticated ``client_for(user)``
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserProfile.objects.create_user(
+            username="admin",
+            email="admin@example.com",
+            role="Admin",
+            is_active=True,
+        )
+        cls.manager = UserProfile.objects.create_user(
+            username="manager",
+            email="manager@example.com",
+            role="Manager",
+            is_active=True,
+        )
+        cls.user = UserProfile.objects.create_user(
+            username="user",
+            email="user@example.com",
+            role="User",
+            is_active=True,
+        )
+        cls.project = Project.objects.create(
+            name="Project", description="d", created_by=cls.admin
+        )
+
+    def create_task(self, **fields):
+        fields = {
+            "title": "Task",
+            "description": "d",
+            "due_date": timezone.now() + timedelta(days=1),
+            "project": self.project,
+            "created_by": self.admin,
+            **fields,
+        }
+        return Task.objects.create(**fields)
+
+    def client_for(self, user):
+        token = RoleTokenObtainPairSerializer.get_token(user).access_token
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def race(self, change):
+        """
+        Run ``change`` right after a bulk write reads its batch, as a
+        concurrent writer would where the read takes no row locks (SQLite)
+        """
+        original = bulk._lock_batch
+
+        def lock_batch(queryset, batch):
+            rows = original(queryset, batch)
+            change()
+            return rows
+
+        return patch.object(bulk, "_lock_batch", lock_batch)
+
+
+class IndexUsageTests(TaskAPITestCase):
+    """
+    Every task query issued by the list and filter endpoints is answered
+    from an index, never by a full scan of the task table
+    """
+
+    def setUp(self):
+        for index, task_status in enumerate(["Pending", "In Progress", "Completed"]):
+            self.create_task(
+                title=f"Task {index}", status=task_status, assigned_to=self.user
+            )
+
+    def full_scans(self, queries):
+        scans = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql = query["sql"]
+                if not sql.startswith("SELECT") or Task._meta.db_table not in sql:
+                    continue
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                for *_, detail in cursor.fetchall():
+                    match = FULL_SCAN.match(detail)
+                    if match and match.group(1) == Task._meta.db_table:
+                        scans.append(sql)
+        return scans
+
+    def assertUsesIndexes(self, user, url, params=None):
+        client = self.client_for(user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.full_scans(queries.captured_queries), [])
+        return response
+
+    def test_task_list(self):
+        url = reverse("task_list")
+        self.assertUsesIndexes(self.admin, url)
+        self.assertUsesIndexes(self.admin, url, {"ordering": "-created_at"})
+        self.assertUsesIndexes(self.admin, url, {"ordering": "priority"})
+        self.assertUsesIndexes(self.admin, url, {"status": "Pending"})
+        self.assertUsesIndexes(self.admin, url, {"priority": "High"})
+
+    def test_task_list_of_user(self):
+        url = reverse("task_list")
+        self.assertUsesIndexes(self.user, url)
+        self.assertUsesIndexes(self.user, url, {"status": "Pending"})
+
+    def test_pending_tasks(self):
+        self.assertUsesIndexes(self.manager, reverse("pending-tasks"))
+
+    def test_project_tasks(self):
+        url = reverse("project_tasks", args=[self.project.pk])
+        self.assertUsesIndexes(self.admin, url)
+        self.assertUsesIndexes(self.admin, url, {"ordering": "-due_date"})
+
+    def test_task_changes(self):
+        url = reverse("task_changes")
+        for user in (self.admin, self.user):
+            since = self.assertUsesIndexes(user, url, {"limit": 1}).data["since"]
+            self.assertUsesIndexes(user, url, {"since": since})
+
+    def test_task_export(self):
+        url = reverse("task_export")
+        self.assertUsesIndexes(self.admin, url, {"status": "Pending"})
+        self.assertUsesIndexes(self.admin, url, {"project": self.project.pk})
+        self.assertUsesIndexes(self.admin, url, {"assigned_to": self.user.pk})
+
+    def test_retention(self):
+        Task.objects.update(updated_at=timezone.now() - timedelta(days=30))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(delete_expired_tasks(expired_tasks(days=7)).deleted, 1)
+        self.assertEqual(self.full_scans(queries.captured_queries), [])
+
+    def test_priority_filter_uses_rank(self):
+        high = self.create_task(title="High", priority="High")
+        response = self.client_for(self.admin).get(
+            reverse("task_list"), {"priority": "High"}
+        )
+        self.assertEqual([row["id"] for row in response.data["results"]], [high.id])
+
+
+class KeysetPaginationTests(TaskAPITestCase):
+    def setUp(self):
+        due_date = timezone.now() + timedelta(days=1)
+        # Shared due dates make the id tie-breaker decide the order
+        self.tasks = [
+            self.create_task(title=f"Task {index}", due_date=due_date)
+            for index in range(5)
+        ]
+        self.client = self.client_for(self.admin)
+
+    def walk(self, url):
+        pages = []
+        while url:
+            data = self.client.get(url).data
+            pages.append([row["id"] for row in data["results"]])
+            url = data["next"]
+        return pages
+
+    def test_pages_cover_every_task_once_across_ties(self):
+        pages = self.walk(f"{reverse('task_list')}?page_size=2")
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(sum(pages, []), [task.id for task in self.tasks])
+
+    def test_writes_between_pages_do_not_shift_the_cursor(self):
+        data = self.client.get(reverse("task_list"), {"page_size": 2}).data
+        self.tasks[0].delete()
+        self.create_task(title="Early", due_date=timezone.now())
+
+        rest = self.walk(data["next"])
+        self.assertEqual(sum(rest, []), [task.id for task in self.tasks[2:]])
+
+    def test_previous_link_returns_the_previous_page(self):
+        first = self.client.get(reverse("task_list"), {"page_size": 2}).data
+        second = self.client.get(first["next"]).data
+        previous = self.client.get(second["previous"]).data
+        self.assertEqual(previous["results"], first["results"])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(reverse("task_list"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 404)
+
+        # Well-formed cursors carrying values of the wrong type
+        for values in [["notadate", 1], [None, 1], [{}, 1], ["2030-01-01", "x"]]:
+            data = json.dumps({"v": values, "r": False})
+            cursor = base64.urlsafe_b64encode(data.encode()).decode()
+            for url in (reverse("task_list"), reverse("task_list_async")):
+                with self.subTest(values=values, url=url):
+                    response = self.client.get(url, {"cursor": cursor})
+                    self.assertEqual(response.status_code, 404)
+
+
+class ProjectCounterTests(TaskAPITestCase):
+    def counters(self):
+        self.project.refresh_from_db()
+        return {field: getattr(self.project, field) for field in COUNTER_FIELDS}
+
+    def test_counters_follow_task_writes(self):
+        task = self.create_task(status="Pending")
+        self.create_task(status="Completed")
+        task.status = "In Progress"
+        task.save()
+        task.delete()
+
+        counters = self.counters()
+        self.assertEqual(counters["total_tasks"], 1)
+        self.assertEqual(counters["completed_tasks"], 1)
+        self.assertEqual(counters["pending_tasks"], 0)
+        self.assertEqual(counters["in_progress_tasks"], 0)
+
+    def test_saving_a_stale_project_keeps_counter_increments(self):
+        stale = Project.objects.get(pk=self.project.pk)
+        self.create_task(status="Pending")
+
+        stale.name = "Renamed"
+        stale.save()
+
+        counters = self.counters()
+        self.assertEqual(self.project.name, "Renamed")
+        self.assertEqual(counters["total_tasks"], 1)
+        self.assertEqual(counters["pending_tasks"], 1)
+
+    def test_rebuild_fixes_drift_and_invalidates_project_detail(self):
+        self.create_task(status="Pending")
+        Project.objects.filter(pk=self.project.pk).update(total_tasks=7)
+        version = get_version("project", self.project.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("project_counters", stdout=StringIO())
+
+        self.assertEqual(self.counters()["total_tasks"], 1)
+        self.assertNotEqual(get_version("project", self.project.pk), version)
+
+
+    def test_rebuild_keeps_writes_made_after_the_scan(self):
+        self.create_task(status="Pending")
+        Project.objects.filter(pk=self.project.pk).update(total_tasks=7)
+        rebuild = project_counters.Command.rebuild
+
+        def rebuild_after_write(command, project_id):
+            # A task written between the drift scan and the locked recount
+            self.create_task(status="In Progress")
+            return rebuild(command, project_id)
+
+        with patch.object(project_counters.Command, "rebuild", rebuild_after_write):
+            call_command("project_counters", stdout=StringIO())
+
+        counters = self.counters()
+        self.assertEqual(counters["total_tasks"], 2)
+        self.assertEqual(counters["pending_tasks"], 1)
+        self.assertEqual(counters["in_progress_tasks"], 1)
+
+class ConditionalGetTests(TaskAPITestCase):
+    def setUp(self):
+        self.client = self.client_for(self.admin)
+        cache.clear()
+
+    def test_task_list_etag_changes_when_a_task_is_deleted(self):
+        url = reverse("task_list")
+        self.create_task(title="Kept")
+        deleted = self.create_task(title="Deleted")
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+        etag = response["ETag"]
+
+        # Revalidating reads the version counter, not the task table
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_task_list_pages_run_no_aggregate(self):
+        for index in range(3):
+            self.create_task(title=f"Task {index}")
+        url = reverse("task_list")
+        with CaptureQueriesContext(connection) as queries:
+            next_url = self.client.get(url, {"page_size": 2}).data["next"]
+            self.client.get(next_url)
+        for query in queries.captured_queries:
+            self.assertNotRegex(query["sql"], r"\b(COUNT|MAX)\(")
+
+    def test_task_list_etag_follows_the_caller_scope(self):
+        self.create_task(assigned_to=self.user)
+        url = reverse("task_list")
+        admin_etag = self.client.get(url)["ETag"]
+        response = self.client_for(self.user).get(url, HTTP_IF_NONE_MATCH=admin_etag)
+        self.assertEqual(response.status_code, 200)
+
+        user_etag = response["ETag"]
+        self.user.role = "Manager"
+        self.user.save()
+        self.addCleanup(cache.clear)
+        response = self.client_for(self.user).get(url, HTTP_IF_NONE_MATCH=user_etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(READ_CACHE_VERSION_TIMEOUT=60)
+    def test_version_keys_of_missing_projects_expire(self):
+        response = self.client.get(reverse("project_detail", args=[999999]))
+        self.assertEqual(response.status_code, 404)
+        key = version_key("project", 999999)
+        self.assertIsNotNone(cache.get(key))
+        with patch("time.time", return_value=time.time() + 61):
+            self.assertIsNone(cache.get(key))
+
+    def test_stale_project_detail_keeps_the_etag_it_was_built_at(self):
+        url = reverse("project_detail", args=[self.project.pk])
+        etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_task()
+        # Another worker is rebuilding the entry, so the stale copy is served
+        version = get_version("project", self.project.pk)
+        variant = hashlib.md5(f"http://testserver{url}".encode()).hexdigest()
+        lock_key = f"project:{self.project.pk}:{version}:{variant}:lock"
+        cache.add(lock_key, 1)
+
+        response = self.client.get(url)
+        self.assertEqual(response.data["total_tasks"], 0)
+        self.assertEqual(response["ETag"], etag)
+
+        cache.delete(lock_key)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["total_tasks"], 1)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+@override_settings(TASK_SYNC_SAFETY_LAG=0)
+class TaskSyncTests(TaskAPITestCase):
+    def sync(self, user, since=None):
+        params = {"since": since} if since else {}
+        response = self.client_for(user).get(reverse("task_changes"), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def changed_ids(self, data):
+        return [task["id"] for task in data["changed"]]
+
+    @override_settings(TASK_SYNC_SAFETY_LAG=60)
+    def test_rows_committed_late_are_not_skipped(self):
+        visible = self.create_task(title="Visible")
+        Task.objects.filter(pk=visible.pk).update(
+            updated_at=timezone.now() - timedelta(seconds=30)
+        )
+        data = self.sync(self.admin)
+        self.assertEqual(data["changed"], [])
+
+        # A slower transaction commits a row stamped before the first one
+        late = self.create_task(title="Late")
+        Task.objects.filter(pk=late.pk).update(
+            updated_at=timezone.now() - timedelta(seconds=40)
+        )
+        # Both fall behind the safety lag
+        Task.objects.update(updated_at=F("updated_at") - timedelta(seconds=60))
+
+        data = self.sync(self.admin, data["since"])
+        self.assertEqual(self.changed_ids(data), [late.id, visible.id])
+
+    def test_invalid_cursor_is_a_bad_request(self):
+        at = timezone.now().isoformat()
+        for position in [["garbage", 1], "ab", [None, 1], [at, "x"], [at]]:
+            data = json.dumps({"t": position, "d": 0, "at": at})
+            since = base64.urlsafe_b64encode(data.encode()).decode()
+            with self.subTest(position=position):
+                response = self.client_for(self.admin).get(
+                    reverse("task_changes"), {"since": since}
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data["since"], "Invalid sync cursor.")
+
+    def test_deletions_reach_every_scope(self):
+        task = self.create_task(assigned_to=self.user)
+        cursors = {user: self.sync(user)["since"] for user in (self.admin, self.user)}
+        task_id = task.id
+        task.delete()
+
+        for user, since in cursors.items():
+            self.assertEqual(self.sync(user, since)["deleted"], [task_id])
+
+    def test_reassignment_is_a_deletion_for_the_previous_assignee(self):
+        task = self.create_task(assigned_to=self.user)
+        bulk = self.create_task(assigned_to=self.user)
+        user_since = self.sync(self.user)["since"]
+        admin_since = self.sync(self.admin)["since"]
+
+        client = self.client_for(self.admin)
+        client.put(
+            reverse("task_update", args=[task.pk]),
+            {"assigned_to": self.manager.pk},
+            format="json",
+        )
+        client.post(
+            reverse("task_bulk_transition"),
+            {"ids": [bulk.pk], "assigned_to": None},
+            format="json",
+        )
+
+        data = self.sync(self.user, user_since)
+        self.assertEqual(data["changed"], [])
+        self.assertEqual(sorted(data["deleted"]), [task.id, bulk.id])
+        data = self.sync(self.admin, admin_since)
+        self.assertEqual(data["deleted"], [])
+        self.assertEqual(sorted(self.changed_ids(data)), [task.id, bulk.id])
+
+    def test_reassigning_back_returns_the_task(self):
+        task = self.create_task(assigned_to=self.user)
+        since = self.sync(self.user)["since"]
+        task.assigned_to = self.manager
+        task.save()
+        task.assigned_to = self.user
+        task.save()
+
+        data = self.sync(self.user, since)
+        self.assertEqual(data["deleted"], [])
+        self.assertEqual(self.changed_ids(data), [task.id])
+
+
+class TaskBulkTests(TaskAPITestCase):
+    def post(self, user, items):
+        response = self.client_for(user).post(
+            reverse("task_bulk"), items, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"]
+
+    def test_batch_updates_counters_versions_and_permissions(self):
+        own = self.create_task(status="Pending", assigned_to=self.user)
+        other = self.create_task(status="Pending")
+        results = self.post(
+            self.user,
+            [
+                {"id": own.id, "status": "In Progress"},
+                {"id": other.id, "status": "In Progress"},
+                {
+                    "title": "New",
+                    "description": "d",
+                    "due_date": "2030-01-01T00:00Z",
+                    "project": self.project.id,
+                    "status": "Pending",
+                },
+            ],
+        )
+
+        self.assertEqual(
+            [result["status"] for result in results], ["updated", "error", "created"]
+        )
+        own.refresh_from_db()
+        self.assertEqual((own.status, own.version), ("In Progress", 2))
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.total_tasks, 3)
+        self.assertEqual(self.project.pending_tasks, 2)
+        self.assertEqual(self.project.in_progress_tasks, 1)
+
+    def test_tasks_are_read_inside_the_writing_transaction(self):
+        task = self.create_task()
+        with CaptureQueriesContext(connection) as queries:
+            self.post(self.admin, [{"id": task.id, "title": "Renamed"}])
+
+        statements = [query["sql"] for query in queries.captured_queries]
+        savepoint = next(
+            index for index, sql in enumerate(statements) if sql.startswith("SAVEPOINT")
+        )
+        task_read = next(
+            index
+            for index, sql in enumerate(statements)
+            if sql.startswith("SELECT") and f'FROM "{Task._meta.db_table}"' in sql
+        )
+        self.assertLess(savepoint, task_read)
+
+
+class TaskBulkTargetTests(TaskAPITestCase):
+    def post(self, user, name, data):
+        return self.client_for(user).post(reverse(name), data, format="json")
+
+    def test_invalid_filter_value_is_a_bad_request(self):
+        for data in ({"project": "abc"}, {"assigned_to": ["x"]}):
+            response = self.post(self.admin, "task_bulk_delete", {"filter": data})
+            self.assertEqual(response.status_code, 400)
+
+    def test_manager_cannot_touch_completed_tasks_by_id_or_filter(self):
+        pending = self.create_task(status="Pending")
+        completed = self.create_task(status="Completed")
+        self.post(
+            self.manager,
+            "task_bulk_transition",
+            {"ids": [pending.id, completed.id], "status": "In Progress"},
+        )
+        response = self.post(
+            self.manager, "task_bulk_delete", {"filter": {"project": self.project.id}}
+        )
+
+        self.assertEqual(response.data["deleted"], 1)
+        self.assertEqual(
+            list(Task.objects.values_list("id", "status")),
+            [(completed.id, "Completed")],
+        )
+
+    def test_rows_leaving_the_scope_after_the_read_are_not_written(self):
+        task = self.create_task(status="Pending")
+        manager_scope = bulk.scoped_task_queryset(self.manager)
+
+        def complete():
+            Task.objects.filter(pk=task.pk).update(status="Completed")
+
+        with self.race(complete):
+            updated = bulk.update_tasks(manager_scope, {"status": "Approved"})
+        self.assertEqual(updated, 0)
+        Task.objects.filter(pk=task.pk).update(status="Pending")
+        with self.race(complete):
+            self.assertEqual(bulk.delete_tasks(manager_scope), 0)
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, "Completed")
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.approved_tasks, 0)
+        self.assertEqual(self.project.total_tasks, 1)
+
+
+class ImportCheckpointTests(TaskAPITestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "tasks.ndjson")
+        with open(self.path, "w") as stream:
+            for index in range(3):
+                record = {
+                    "title": f"Imported {index}",
+                    "due_date": "2030-01-01T00:00:00Z",
+                    "project_id": self.project.id,
+                    "created_by": self.admin.username,
+                }
+                stream.write(json.dumps(record) + "\n")
+
+    def import_tasks(self):
+        call_command(
+            "import_tasks",
+            self.path,
+            batch_size=1,
+            checkpoint="nightly",
+            stdout=StringIO(),
+            stderr=StringIO(),
+        )
+
+    def test_interrupted_import_resumes_without_gaps_or_duplicates(self):
+        calls = []
+
+        def crash_on_second_batch(deltas):
+            calls.append(deltas)
+            if len(calls) == 2:
+                raise RuntimeError("crashed")
+            apply_counter_deltas(deltas)
+
+        with patch.object(
+            import_tasks, "apply_counter_deltas", crash_on_second_batch
+        ), self.assertRaises(RuntimeError):
+            self.import_tasks()
+
+        # The crashed batch rolled back together with its progress
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(ImportCheckpoint.objects.get(name="nightly").records, 1)
+
+        self.import_tasks()
+        self.assertEqual(
+            sorted(Task.objects.values_list("title", flat=True)),
+            ["Imported 0", "Imported 1", "Imported 2"],
+        )
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.total_tasks, 3)
+
+
+class ApprovalQueueTests(TaskAPITestCase):
+    def setUp(self):
+        self.queue = ApprovalQueue(client=fakeredis.FakeRedis())
+        self.task = self.create_task(status="Pending Approval")
+        self.due = self.queue.schedule(self.task.id, delay=60, now=1000)
+
+    def status(self):
+        self.task.refresh_from_db()
+        return self.task.status
+
+    def assertSettled(self):
+        self.assertFalse(self.queue.is_scheduled(self.task.id))
+        self.assertEqual(self.queue.client.zcard(self.queue.processing_key), 0)
+
+    def test_sweep_approves_due_tasks(self):
+        self.assertEqual(self.queue.sweep(now=self.due - 1), 0)
+        self.assertEqual(self.queue.sweep(now=self.due), 1)
+        self.assertEqual(self.status(), "Approved")
+        self.assertSettled()
+
+    def test_failed_sweep_puts_approvals_back(self):
+        with patch("base.approvals.update_tasks", side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                self.queue.sweep(now=self.due)
+        self.assertEqual(self.status(), "Pending Approval")
+        self.assertTrue(self.queue.is_scheduled(self.task.id))
+
+        self.assertEqual(self.queue.sweep(now=self.due), 1)
+        self.assertEqual(self.status(), "Approved")
+        self.assertSettled()
+
+    def test_approvals_of_a_dead_sweeper_are_requeued_after_the_lease(self):
+        self.assertEqual(self.queue.claim_due(now=self.due, lease=30), [self.task.id])
+        self.assertEqual(self.queue.sweep(now=self.due + 10), 0)
+
+        self.assertEqual(self.queue.sweep(now=self.due + 30), 1)
+        self.assertEqual(self.status(), "Approved")
+        self.assertSettled()
+
+    def test_revoked_in_flight_approval_is_dropped(self):
+        self.queue.claim_due(now=self.due, lease=30)
+        self.assertFalse(self.queue.revoke(self.task.id))
+
+        self.assertEqual(self.queue.sweep(now=self.due + 30), 0)
+        self.assertEqual(self.status(), "Pending Approval")
+        self.assertSettled()
+
+    def test_task_leaving_pending_approval_during_the_sweep_is_kept(self):
+        def send_back():
+            Task.objects.filter(pk=self.task.pk).update(status="Pending")
+
+        with self.race(send_back):
+            self.assertEqual(self.queue.sweep(now=self.due), 0)
+        self.assertEqual(self.status(), "Pending")
+        self.assertSettled()
+
+
+class ApprovalViewTests(TaskAPITestCase):
+    def setUp(self):
+        self.queue = ApprovalQueue(client=fakeredis.FakeRedis())
+        for patcher in [
+            patch.object(views, "approval_queue", self.queue),
+            # Outside the user role's access hours the requests would be refused
+            patch.object(TimeBasedAccessMiddleware, "check_access", return_value=None),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.task = self.create_task(status="Pending Approval")
+
+    def post(self, user, name):
+        return self.client_for(user).post(reverse(name, args=[self.task.id]))
+
+    @override_settings(TASK_APPROVAL_DELAY=90)
+    def test_approval_message_follows_the_delay(self):
+        response = self.post(self.manager, "approve_task")
+        self.assertEqual(
+            response.data["message"],
+            "Task has been approved and will be saved in 90 seconds.",
+        )
+        self.assertTrue(self.queue.is_scheduled(self.task.id))
+
+    def test_only_managers_revoke_approvals(self):
+        self.queue.schedule(self.task.id)
+        for user in (self.user, self.admin):
+            self.assertEqual(self.post(user, "revoke_approval").status_code, 403)
+        self.assertTrue(self.queue.is_scheduled(self.task.id))
+
+        self.queue.revoke(self.task.id)
+        self.task.transition("Pending Approval", "Approved")
+        self.assertEqual(self.post(self.user, "revoke_approval").status_code, 403)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "Approved")
+
+        self.assertEqual(self.post(self.manager, "revoke_approval").status_code, 200)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "Pending Approval")
+
+
+class TaskVersionTests(TaskAPITestCase):
+    def test_saving_a_stale_instance_never_reuses_a_version(self):
+        task = self.create_task()
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        first.title = "First"
+        first.save()
+        second.title = "Second"
+        second.save(update_fields=["title"])
+
+        self.assertEqual((first.version, second.version), (2, 3))
+        task.refresh_from_db()
+        self.assertEqual(task.version, 3)
+
+    def test_get_etag_guards_put(self):
+        task = self.create_task(assigned_to=self.user)
+        client = self.client_for(self.admin)
+        url = reverse("task_update", args=[task.pk])
+        response = client.get(url)
+        etag = response["ETag"]
+        self.assertEqual(response.data["id"], task.pk)
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # A save that bypasses If-Match still invalidates the ETag
+        stale = Task.objects.get(pk=task.pk)
+        stale.title = "Changed elsewhere"
+        stale.save()
+        response = client.put(url, {"title": "Mine"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+
+        etag = client.get(url)["ETag"]
+        response = client.put(url, {"title": "Mine"}, format="json", HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_users_only_read_their_tasks(self):
+        task = self.create_task()
+        response = self.client_for(self.user).get(
+            reverse("task_update", args=[task.pk])
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class RetentionTests(TaskAPITestCase):
+    def age(self, task, days):
+        Task.objects.filter(pk=task.pk).update(
+            updated_at=timezone.now() - timedelta(days=days)
+        )
+
+    def test_retention_counts_from_completion(self):
+        stale = self.create_task(status="Completed")
+        self.age(stale, 10)
+        # Created long ago but completed just now
+        fresh = self.create_task(status="Pending")
+        Task.objects.filter(pk=fresh.pk).update(
+            created_at=timezone.now() - timedelta(days=10)
+        )
+        fresh.status = "Completed"
+        fresh.save()
+
+        self.assertEqual(list(expired_tasks(days=7)), [stale])
+
+    def test_raw_delete_needs_no_foreign_receivers(self):
+        self.assertTrue(can_raw_delete())
+        with override_settings(TASK_RAW_DELETE=False):
+            self.assertFalse(can_raw_delete())
+
+        def receiver(**kwargs):
+            pass
+
+        pre_delete.connect(receiver, sender=Task)
+        self.addCleanup(pre_delete.disconnect, receiver, sender=Task)
+        self.assertFalse(can_raw_delete())
+
+    @override_settings(TASK_RAW_DELETE=False)
+    def test_collector_fallback_keeps_counters_and_tombstones(self):
+        task = self.create_task(status="Completed")
+        self.age(task, 10)
+
+        report = delete_expired_tasks(expired_tasks(days=7), archive=False)
+
+        self.assertEqual(report.deleted, 1)
+        self.assertTrue(TaskTombstone.objects.filter(task_id=task.id).exists())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.total_tasks, 0)
+
+    def test_restored_tasks_are_not_archived_again(self):
+        task = self.create_task(status="Completed")
+        self.age(task, 10)
+        created_at = Task.objects.get(pk=task.pk).created_at
+
+        report = delete_expired_tasks(expired_tasks(days=7), archive=True)
+        self.assertEqual(report.deleted, 1)
+        self.assertEqual(restore_tasks(ArchivedTask.objects.all()), (1, 0))
+
+        report = delete_expired_tasks(expired_tasks(days=7), archive=True)
+        self.assertEqual(report.deleted, 0)
+        restored = Task.objects.get(pk=task.pk)
+        self.assertEqual(restored.status, "Completed")
+        self.assertEqual(restored.created_at, created_at)
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.completed_tasks, 1)
+
+
+    def test_archive_conflict_keeps_the_task(self):
+        task = self.create_task(status="Completed", title="Live")
+        self.age(task, 10)
+        ArchivedTask.objects.create(
+            **{field: getattr(task, field) for field in ARCHIVE_FIELDS}
+        )
+        ArchivedTask.objects.filter(pk=task.pk).update(title="Older copy")
+
+        with self.assertRaises(IntegrityError):
+            delete_expired_tasks(expired_tasks(days=7), archive=True)
+
+        self.assertTrue(Task.objects.filter(pk=task.pk).exists())
+        self.assertEqual(ArchivedTask.objects.get(pk=task.pk).title, "Older copy")
+
+@override_settings(CONFIG_REGISTRY_CHECK_INTERVAL=60)
+class ConfigRegistryTests(TaskAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.clock = 1000.0
+        patcher = patch("base.config.time.monotonic", lambda: self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.registry = ConfigRegistry()
+
+    def configure(self, name, value, active=True):
+        with self.captureOnCommitCallbacks(execute=True):
+            return TaskConfigurations.objects.create(
+                config_name=name,
+                config_value=value,
+                status=active,
+                created_by=self.admin,
+            )
+
+    def test_cast_and_default(self):
+        self.configure("task_expiry", "7")
+        self.configure("label", "abc")
+        self.assertEqual(self.registry.get("task_expiry", int, default=2), 7)
+        self.assertEqual(self.registry.get("task_expiry"), "7")
+        self.assertEqual(self.registry.get("label", int, default=2), 2)
+        self.assertEqual(self.registry.get("missing", int, default=2), 2)
+
+    def test_bool_values(self):
+        self.configure("on", " Yes ")
+        self.configure("off", "off")
+        self.assertIs(self.registry.get("on", bool), True)
+        self.assertIs(self.registry.get("off", bool), False)
+        self.assertIsNone(self.registry.get("missing", bool))
+
+    def test_inactive_rows_are_ignored(self):
+        self.configure("task_expiry", "7")
+        self.configure("task_expiry", "9", active=False)
+        self.configure("disabled", "1", active=False)
+        self.assertEqual(self.registry.snapshot(), {"task_expiry": "7"})
+
+    def test_writes_are_picked_up_after_the_check_interval(self):
+        config = self.configure("task_expiry", "7")
+        self.assertEqual(self.registry.get("task_expiry", int), 7)
+
+        config.config_value = "3"
+        with self.captureOnCommitCallbacks(execute=True):
+            config.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.registry.get("task_expiry", int), 7)
+        self.clock += 60
+        self.assertEqual(self.registry.get("task_expiry", int), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            config.delete()
+        self.assertEqual(self.registry.get("task_expiry", int), 3)
+        self.clock += 60
+        self.assertIsNone(self.registry.get("task_expiry", int))
+
+    def test_unchanged_version_skips_the_reload(self):
+        self.configure("task_expiry", "7")
+        self.registry.snapshot()
+        self.clock += 60
+        with self.assertNumQueries(0):
+            self.assertEqual(self.registry.get("task_expiry", int), 7)
+
+    def test_get_config_reads_the_shared_registry(self):
+        registry.clear()
+        self.addCleanup(registry.clear)
+        self.configure("task_expiry", "5")
+        self.assertEqual(get_config("task_expiry", int, default=2), 5)
+
+
+class SparseFieldsetTests(TaskAPITestCase):
+    def test_fields_and_exclude_narrow_the_output_and_the_select(self):
+        self.create_task(title="Sparse")
+        client = self.client_for(self.admin)
+        full = client.get(reverse("task_list")).data["results"][0]
+        for params, expected in [
+            ({"fields": "id,title"}, {"id", "title"}),
+            ({"exclude": "description"}, set(full) - {"description"}),
+        ]:
+            with self.subTest(params=params):
+                with CaptureQueriesContext(connection) as queries:
+                    response = client.get(reverse("task_list"), params)
+                row = response.data["results"][0]
+                self.assertEqual(row, {name: full[name] for name in expected})
+                selects = [
+                    query["sql"]
+                    for query in queries.captured_queries
+                    if query["sql"].startswith("SELECT")
+                    and f'FROM "{Task._meta.db_table}"' in query["sql"]
+                ]
+                self.assertTrue(selects)
+                for sql in selects:
+                    self.assertNotIn('"description"', sql)
+
+
+@skipUnless(msgpack is not None, "msgpack is not installed")
+class MessagePackTests(TaskAPITestCase):
+    def setUp(self):
+        for index, task_status in enumerate(["Pending", "Completed", "Pending"]):
+            self.create_task(title=f"Task {index}", status=task_status)
+        self.client = self.client_for(self.admin)
+        self.rows = self.client.get(reverse("task_list")).json()["results"]
+
+    def get(self, media_type):
+        response = self.client.get(reverse("task_list"), HTTP_ACCEPT=media_type)
+        self.assertEqual(response["Content-Type"], media_type)
+        return msgpack.unpackb(response.content, timestamp=3)
+
+    def assertSameRows(self, rows):
+        # Datetimes arrive as MessagePack timestamps instead of ISO strings
+        datetimes = ("due_date", "created_at", "updated_at")
+        expected = [
+            {
+                name: parse_datetime(value) if name in datetimes else value
+                for name, value in row.items()
+            }
+            for row in self.rows
+        ]
+        self.assertEqual(rows, expected)
+
+    def test_rows(self):
+        self.assertSameRows(self.get("application/msgpack")["results"])
+
+    def test_columns(self):
+        results = self.get("application/x-msgpack-columnar")["results"]
+        self.assertEqual(results["count"], 3)
+        status_column = results["columns"]["status"]
+        self.assertEqual(status_column["dictionary"], ["Pending", "Completed"])
+        self.assertEqual(status_column["codes"], [0, 1, 0])
+
+        rows = []
+        for index in range(results["count"]):
+            row = {}
+            for name in results["fields"]:
+                column = results["columns"][name]
+                if name in views.TaskListView.dictionary_fields:
+                    row[name] = column["dictionary"][column["codes"][index]]
+                else:
+                    row[name] = column[index]
+            rows.append(row)
+        self.assertSameRows(rows)
+
+
+class RenderingTests(TaskAPITestCase):
+    def setUp(self):
+        for index in range(20):
+            self.create_task(title=f"Tâche {index}", description="d" * 100)
+        self.client = self.client_for(self.admin)
+
+    def test_fast_json_matches_drf(self):
+        data = self.client.get(reverse("task_list")).data
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_responses_are_compressed_above_the_minimum_size(self):
+        url = reverse("task_list")
+        raw = self.client.get(url).content
+        for min_size, compressed in [(len(raw), True), (len(raw) + 1, False)]:
+            with self.subTest(min_size=min_size):
+                with override_settings(RESPONSE_COMPRESSION_MIN_SIZE=min_size):
+                    response = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+                if compressed:
+                    self.assertEqual(response["Content-Encoding"], "gzip")
+                    self.assertEqual(gzip.decompress(response.content), raw)
+                else:
+                    self.assertFalse(response.has_header("Content-Encoding"))
+                    self.assertEqual(response.content, raw)
+
+
+class TaskExportTests(TaskAPITestCase):
+    def setUp(self):
+        self.tasks = [
+            self.create_task(title='Quoted, "comma"', assigned_to=self.user),
+            self.create_task(title="Unassigned"),
+        ]
+        self.client = self.client_for(self.admin)
+
+    def export(self, **params):
+        response = self.client.get(reverse("task_export"), params)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content)
+
+    def test_csv_ndjson_and_gzip_content(self):
+        response, body = self.export(output="csv")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(StringIO(body.decode())))
+        self.assertEqual([row["id"] for row in rows], [str(t.id) for t in self.tasks])
+        self.assertEqual(rows[0]["title"], 'Quoted, "comma"')
+        self.assertEqual(rows[0]["project_name"], self.project.name)
+        self.assertEqual(rows[0]["assigned_to_username"], self.user.username)
+        self.assertEqual(rows[1]["assigned_to_username"], "")
+
+        response, lines = self.export(output="ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in lines.decode().splitlines()]
+        # The same values as the CSV, with nulls instead of empty cells
+        for record, row in zip(records, rows, strict=True):
+            cells = {
+                key: "" if value is None else str(value)
+                for key, value in record.items()
+            }
+            self.assertEqual(cells, row)
+
+        response, compressed = self.export(output="csv", gzip="1")
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn('filename="tasks.csv.gz"', response["Content-Disposition"])
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(gzip.decompress(compressed), body)
@@ -1,9 +1,17 @@
 from django.urls import path
 from .views import (
     TaskCreateUpdateView,
+    TaskBulkView,
+    TaskBulkTransitionView,
+    TaskBulkDeleteView,
     TaskListView,
+    TaskChangesView,
+    ArchivedTaskListView,
+    ArchivedTaskDetailView,
+    TaskExportView,
     TaskDeleteView,
     ProjectDetailView,
+    ProjectTasksView,
     ProjectDeleteView,
     ProjectCreateView,
     ProjectUpdateView,
@@ -11,13 +19,36 @@ from .views import (
     RevokeApprovalView,
     PendingTasksView,
 )
+from .async_views import (
+    AsyncTaskListView,
+    AsyncPendingTasksView,
+    AsyncProjectDetailView,
+)
 
 urlpatterns = [
     path("tasks/", TaskListView.as_view(), name="task_list"),
+    path("tasks/changes/", TaskChangesView.as_view(), name="task_changes"),
+    path("tasks/export/", TaskExportView.as_view(), name="task_export"),
+    path("tasks/archive/", ArchivedTaskListView.as_view(), name="task_archive"),
+    path(
+        "tasks/archive/<int:pk>/",
+        ArchivedTaskDetailView.as_view(),
+        name="task_archive_detail",
+    ),
     path("create/", TaskCreateUpdateView.as_view(), name="task_create"),
+    path("tasks/bulk/", TaskBulkView.as_view(), name="task_bulk"),
+    path(
+        "tasks/bulk/transition/",
+        TaskBulkTransitionView.as_view(),
+        name="task_bulk_transition",
+    ),
+    path("tasks/bulk/delete/", TaskBulkDeleteView.as_view(), name="task_bulk_delete"),
     path("tasks/<int:pk>/", TaskCreateUpdateView.as_view(), name="task_update"),
     path("tasks/<int:pk>/delete/", TaskDeleteView.as_view(), name="task_delete"),
     path("projects/<int:pk>/", ProjectDetailView.as_view(), name="project_detail"),
+    path(
+        "projects/<int:pk>/tasks/", ProjectTasksView.as_view(), name="project_tasks"
+    ),
     path(
         "projects/<int:pk>/delete/", ProjectDeleteView.as_view(), name="project_delete"
     ),
@@ -28,4 +59,15 @@ urlpatterns = [
     path("approve/<int:task_id>/", ApproveTaskView.as_view(), name="approve_task"),
     path("revoke/<int:task_id>/", RevokeApprovalView.as_view(), name="revoke_approval"),
     path("tasks/pending/", PendingTasksView.as_view(), name="pending-tasks"),
+    path("async/tasks/", AsyncTaskListView.as_view(), name="task_list_async"),
+    path(
+        "async/tasks/pending/",
+        AsyncPendingTasksView.as_view(),
+        name="pending-tasks-async",
+    ),
+    path(
+        "async/projects/<int:pk>/",
+        AsyncProjectDetailView.as_view(),
+        name="project_detail_async",
+    ),
 ]
@@ -1,19 +1,45 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Task, Project
-from .serializers import TaskSerializer, ProjectSerializer
+from rest_framework.exceptions import ValidationError
+from account.models import UserProfile
+from .models import ArchivedTask, Task, Project, TaskTombstone
+from .serializers import (
+    ArchivedTaskSerializer,
+    TaskSerializer,
+    ProjectSerializer,
+    ProjectSummarySerializer,
+    task_values_serializer,
+)
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.template.defaultfilters import pluralize
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_etags
 from rest_framework import generics
 from rest_framework.generics import ListAPIView, RetrieveAPIView
-from django.db.models import Count
+from rest_framework.pagination import _positive_int
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter
+from .approvals import approval_queue
+from .bulk import (
+    apply_task_batch,
+    delete_tasks,
+    scoped_task_queryset,
+    update_tasks,
+)
+from .caching import get_or_build, get_version, request_variant
+from .export import EXPORT_FORMATS, export_chunks
+from .filters import TaskExportFilter, TaskFilter
+from .conditional import ConditionalListMixin, make_etag, set_validators
+from .pagination import ArchivedTaskPagination, TaskPagination
 from .permissions import IsAdmin
-from .task import save_task_to_db
+from .sync import get_changes
 from rest_framework.permissions import IsAuthenticated
-from django.core.cache import cache
+from rest_framework.settings import api_settings
+from main.renderers import BINARY_RENDERER_CLASSES
 
 
 class TaskCreateUpdateView(APIView):
@@ -21,10 +47,26 @@ class TaskCreateUpdateView(APIView):
     Admin: Full access
     Manager: Can create and update tasks, mark tasks as completed
     User: Can create and update assigned tasks, and update status to in-progress
+
+    GET returns a task with the ETag PUT takes as ``If-Match``.
     """
 
     permission_classes = [IsAuthenticated]
 
+    def get(self, request, pk):
+        task = get_object_or_404(Task, pk=pk)
+        if request.user.role == "User" and task.assigned_to_id != request.user.id:
+            return Response(
+                {"error": "Permission denied."}, status=status.HTTP_403_FORBIDDEN
+            )
+
+        # The ETag (``"<pk>-<version>"``) is what PUT accepts as If-Match
+        response = get_conditional_response(request, etag=task.etag)
+        if response is None:
+            response = Response(TaskSerializer(task).data, status=status.HTTP_200_OK)
+        response["ETag"] = task.etag
+        return response
+
     def post(self, request):
         if request.user.role not in ["Admin", "Manager", "User"]:
             return Response(
@@ -40,7 +82,7 @@ class TaskCreateUpdateView(APIView):
 
     def put(self, request, pk):
         task = get_object_or_404(Task, pk=pk)
-        if request.user.role == "User" and task.assigned_to != request.user:
+        if request.user.role == "User" and task.assigned_to_id != request.user.id:
             return Response(
                 {"error": "Permission denied."}, status=status.HTTP_403_FORBIDDEN
             )
@@ -50,42 +92,413 @@ class TaskCreateUpdateView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
+        # Optimistic concurrency: ``If-Match: <ETag>`` fails fast with 412
+        # when the task changed since it was read, without locking the row
+        etags = [
+            etag.removeprefix("W/")
+            for etag in parse_etags(request.headers.get("If-Match", ""))
+        ]
+        if etags and "*" not in etags and task.etag not in etags:
+            return self.precondition_failed()
+
         serializer = TaskSerializer(
             task, data=request.data, partial=True, context={"request": request}
         )
         if serializer.is_valid():
-            task = serializer.save()
-            return Response(
+            if not etags:
+                task = serializer.save()
+            elif not task.conditional_update(
+                {"version": task.version}, **serializer.validated_data
+            ):
+                return self.precondition_failed()
+            response = Response(
                 {
                     "message": "Task updated successfully",
                     "task": TaskSerializer(task).data,
                 },
                 status=status.HTTP_200_OK,
             )
+            response["ETag"] = task.etag
+            return response
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @staticmethod
+    def precondition_failed():
+        return Response(
+            {"error": "Task was modified by another request, reload it and retry."},
+            status=status.HTTP_412_PRECONDITION_FAILED,
+        )
+
+
+class TaskBulkView(APIView):
+    """
+    Batch of task creates (items without ``id``) and partial updates (items
+    with ``id``), applying the same per-role rules as TaskCreateUpdateView.
+    Returns one result per item.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role not in ["Admin", "Manager", "User"]:
+            return Response(
+                {"error": "Permission denied."}, status=status.HTTP_403_FORBIDDEN
+            )
+
+        items = request.data
+        max_items = getattr(settings, "TASK_BULK_MAX_ITEMS", 50000)
+        if not isinstance(items, list):
+            return Response(
+                {"error": "Expected a list of tasks."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > max_items:
+            return Response(
+                {"error": f"A batch may contain at most {max_items} tasks."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {"results": apply_task_batch(request.user, items)},
+            status=status.HTTP_200_OK,
+        )
+
+
+def get_task_values_serializer(request):
+    """
+    Task values serializer narrowed by the ``?fields=`` and ``?exclude=``
+    query parameters (comma-separated field names)
+    """
+    fields, exclude = (
+        [name for name in request.query_params.get(param, "").split(",") if name]
+        for param in ("fields", "exclude")
+    )
+    if not fields and not exclude:
+        return task_values_serializer
+    return task_values_serializer.narrow(fields, exclude)
+
+
+class TaskValuesListMixin:
+    """
+    Lists tasks through ``task_values_serializer``: rows are read with
+    ``.values()`` and turned into TaskSerializer-shaped dicts without
+    building model instances or running per-field serializers.
+    Supports sparse fieldsets via ``?fields=`` / ``?exclude=``, and
+    MessagePack (row or columnar) responses when msgpack is installed.
+    """
+
+    renderer_classes = [
+        *api_settings.DEFAULT_RENDERER_CLASSES,
+        *BINARY_RENDERER_CLASSES,
+    ]
+    # Dictionary-encoded by the columnar renderer
+    dictionary_fields = ("status", "priority")
+
+    def get_values_serializer(self):
+        if not hasattr(self, "_values_serializer"):
+            self._values_serializer = get_task_values_serializer(self.request)
+        return self._values_serializer
+
+    def as_values(self, queryset):
+        fields = self.get_values_serializer().sources
+        if self.paginator is not None:
+            fields = [*fields, *self.paginator.get_ordering_fields(self.request)]
+        return queryset.values(*dict.fromkeys(fields))
+
+    def serialize_rows(self, rows):
+        return self.get_values_serializer().serialize(rows)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.as_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize_rows(page))
+        return Response(self.serialize_rows(queryset))
+
+
+class TaskBulkTargetMixin:
+    """
+    Resolves the tasks targeted by a bulk action: either ``{"ids": [...]}`` or
+    ``{"filter": {...}}`` over the fields below, within the caller's role scope.
+    """
+
+    filter_fields = {
+        "status": "status",
+        "priority": "priority",
+        "project": "project_id",
+        "assigned_to": "assigned_to_id",
+    }
+
+    def get_target(self, request):
+        data = request.data if isinstance(request.data, dict) else {}
+        ids, filters = data.get("ids"), data.get("filter")
+        if (ids is None) == (filters is None):
+            raise ValidationError({"error": "Provide either 'ids' or 'filter'."})
+
+        queryset = scoped_task_queryset(request.user)
+        if ids is not None:
+            if not isinstance(ids, list) or not all(
+                isinstance(pk, int) and not isinstance(pk, bool) for pk in ids
+            ):
+                raise ValidationError({"error": "'ids' must be a list of task ids."})
+            return queryset, ids
+
+        if not isinstance(filters, dict) or not filters:
+            raise ValidationError({"error": "'filter' must be a non-empty object."})
+        unknown = set(filters) - set(self.filter_fields)
+        if unknown:
+            raise ValidationError(
+                {"error": f"Unsupported filter fields: {', '.join(sorted(unknown))}."}
+            )
+        lookups = {self.filter_fields[key]: value for key, value in filters.items()}
+        try:
+            return queryset.filter(**lookups), None
+        except (TypeError, ValueError, DjangoValidationError):
+            raise ValidationError(
+                {"error": f"Invalid filter values: {', '.join(sorted(filters))}."}
+            )
+
+
+class TaskBulkTransitionView(TaskBulkTargetMixin, APIView):
+    """
+    Set the status and/or assignee of many tasks with one UPDATE per batch.
+    """
 
-class TaskListView(ListAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role not in ["Admin", "Manager", "User"]:
+            return Response(
+                {"error": "Permission denied."}, status=status.HTTP_403_FORBIDDEN
+            )
+
+        data = request.data if isinstance(request.data, dict) else {}
+        changes = {}
+        if "status" in data:
+            if data["status"] not in dict(Task.STATUS_CHOICES):
+                raise ValidationError({"error": "Invalid status."})
+            changes["status"] = data["status"]
+        if "assigned_to" in data:
+            assignee = data["assigned_to"]
+            if assignee is not None and not (
+                isinstance(assignee, int)
+                and UserProfile.objects.filter(pk=assignee).exists()
+            ):
+                raise ValidationError({"error": "Invalid assignee."})
+            changes["assigned_to_id"] = assignee
+        if not changes:
+            raise ValidationError({"error": "Provide 'status' and/or 'assigned_to'."})
+
+        queryset, ids = self.get_target(request)
+        updated = update_tasks(queryset, changes, ids=ids)
+        return Response({"updated": updated}, status=status.HTTP_200_OK)
+
+
+class TaskBulkDeleteView(TaskBulkTargetMixin, APIView):
+    """
+    Delete many tasks with one DELETE per batch.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        if request.user.role == "User":
+            return Response(
+                {"error": "Users cannot delete tasks."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        queryset, ids = self.get_target(request)
+        deleted = delete_tasks(queryset, ids=ids)
+        return Response({"deleted": deleted}, status=status.HTTP_200_OK)
+
+
+class TaskListView(ConditionalListMixin, TaskValuesListMixin, ListAPIView):
     permission_classes = [IsAuthenticated]
     queryset = Task.objects.select_related("project", "assigned_to").all()
     serializer_class = TaskSerializer
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
-    filterset_fields = ["priority", "status", "due_date"]
-    ordering_fields = ["priority", "due_date"]
+    pagination_class = TaskPagination
+    # Ordering is applied by TaskPagination (?ordering=) so pages can seek
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TaskFilter
+
+    def get_queryset(self):
+        if self.request.user.role == "User":
+            return Task.objects.filter(assigned_to_id=self.request.user.id)
+        return super().get_queryset()
+
+
+class TaskExportView(generics.GenericAPIView):
+    """
+    Streams tasks with project name and assignee username.
+    ``?output=csv|ndjson|msgpack|msgpack-columnar`` picks the format (the
+    MessagePack ones need msgpack installed) and ``?gzip=1`` compresses it.
+    """
+
+    permission_classes = [IsAuthenticated]
+    queryset = Task.objects.all()
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TaskExportFilter
 
     def get_queryset(self):
         if self.request.user.role == "User":
-            return Task.objects.filter(assigned_to=self.request.user)
+            return Task.objects.filter(assigned_to_id=self.request.user.id)
         return super().get_queryset()
 
+    def get(self, request):
+        output = request.query_params.get("output", "csv")
+        if output not in EXPORT_FORMATS:
+            formats = ", ".join(EXPORT_FORMATS)
+            return Response(
+                {"error": f"Unsupported output, use one of: {formats}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        compress = request.query_params.get("gzip") in ("1", "true")
+        content_type, extension = EXPORT_FORMATS[output]
+        filename = f"tasks.{extension}"
+        if compress:
+            content_type, filename = "application/gzip", f"{filename}.gz"
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(
+            export_chunks(queryset, output=output, compress=compress),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ArchivedTaskMixin:
+    """
+    Completed tasks moved to the archive by the retention job. Users only
+    see tasks that were assigned to them.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = ArchivedTaskSerializer
+
+    def get_queryset(self):
+        if self.request.user.role == "User":
+            return ArchivedTask.objects.filter(assigned_to_id=self.request.user.id)
+        return ArchivedTask.objects.all()
+
+
+class ArchivedTaskListView(ArchivedTaskMixin, ListAPIView):
+    pagination_class = ArchivedTaskPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["project_id", "assigned_to_id"]
+
+
+class ArchivedTaskDetailView(ArchivedTaskMixin, RetrieveAPIView):
+    pass
+
+
+class TaskChangesView(APIView):
+    """
+    Incremental sync: tasks created or updated after ``?since=`` plus the ids
+    of tasks deleted (or, for users, reassigned away) since then. Pass the
+    returned ``since`` back on the next call; omit it for a full initial sync.
+    Changes show up after a ``TASK_SYNC_SAFETY_LAG`` delay.
+    """
+
+    permission_classes = [IsAuthenticated]
+    default_limit = 500
+    max_limit = 1000
+
+    def get(self, request):
+        tasks = Task.objects.all()
+        tombstones = TaskTombstone.objects.all()
+        if request.user.role == "User":
+            tasks = tasks.filter(assigned_to_id=request.user.id)
+            # Includes tasks reassigned away from the user
+            tombstones = tombstones.filter(assigned_to_id=request.user.id)
+        else:
+            tombstones = tombstones.filter(reassigned=False)
+
+        try:
+            limit = _positive_int(
+                request.query_params["limit"], strict=True, cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            limit = self.default_limit
+
+        changes = get_changes(
+            tasks, tombstones, since=request.query_params.get("since"), limit=limit
+        )
+        changes["changed"] = TaskSerializer(changes["changed"], many=True).data
+        return Response(changes)
+
 
 class ProjectDetailView(RetrieveAPIView):
+    """
+    Project summary with the first page of its tasks; the rest is served by
+    ProjectTasksView through the ``tasks_next`` cursor link.
+    """
+
     permission_classes = [IsAuthenticated]
-    queryset = Project.objects.prefetch_related("tasks").annotate(
-        total_tasks=Count("tasks"),
-        completed_tasks=Count("tasks", filter=Q(tasks__status="Completed")),
-    )
-    serializer_class = ProjectSerializer
+    # Task counts are denormalized onto Project (see base.counters)
+    queryset = Project.objects.all()
+    serializer_class = ProjectSummarySerializer
+    tasks_preview_size = 20
+
+    def retrieve(self, request, *args, **kwargs):
+        # Cached per project version; task and project signals bump it
+        variant = request_variant(request)
+        etag = make_etag(get_version("project", self.kwargs["pk"]), variant)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            data, version = get_or_build(
+                "project",
+                self.kwargs["pk"],
+                variant,
+                lambda: self.build_response_data(request),
+            )
+            # A stale entry served during a rebuild carries its own version
+            etag = make_etag(version, variant)
+            response = Response(data)
+        return set_validators(response, etag)
+
+    def build_response_data(self, request):
+        project = self.get_object()
+        paginator = self.get_tasks_paginator()
+        tasks = paginator.paginate_queryset(
+            self.get_tasks_queryset(project, paginator),
+            request,
+            base_url=self.get_tasks_url(project),
+        )
+        return self.get_response_data(project, tasks, paginator)
+
+    def get_tasks_queryset(self, project, paginator):
+        # ?fields= / ?exclude= narrow the embedded tasks and their SELECT
+        fields = [
+            *get_task_values_serializer(self.request).sources,
+            *paginator.get_ordering_fields(self.request),
+        ]
+        return project.tasks.values(*dict.fromkeys(fields))
+
+    def get_tasks_paginator(self):
+        paginator = TaskPagination()
+        paginator.page_size = paginator.max_page_size = self.tasks_preview_size
+        return paginator
+
+    def get_tasks_url(self, project):
+        return reverse("project_tasks", kwargs={"pk": project.pk})
+
+    def get_response_data(self, project, tasks, paginator):
+        data = self.get_serializer(project).data
+        data["tasks"] = get_task_values_serializer(self.request).serialize(tasks)
+        data["tasks_next"] = paginator.get_next_link()
+        return data
+
+
+class ProjectTasksView(TaskValuesListMixin, ListAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = TaskSerializer
+    pagination_class = TaskPagination
+
+    def get_queryset(self):
+        project = get_object_or_404(Project.objects.only("id"), pk=self.kwargs["pk"])
+        return Task.objects.filter(project_id=project.id)
 
 
 class TaskDeleteView(APIView):
@@ -130,7 +543,7 @@ class ProjectCreateView(generics.CreateAPIView):
     serializer_class = ProjectSerializer
 
     def perform_create(self, serializer):
-        serializer.save(created_by=self.request.user)
+        serializer.save(created_by_id=self.request.user.id)
 
 
 class ProjectUpdateView(generics.UpdateAPIView):
@@ -170,17 +583,16 @@ class ApproveTaskView(APIView):
                 },
                 status=400,
             )
-        task_data = {
-            "title": task.title,
-            "description": task.description,
-            "status": task.status,
-            "created_at": str(task.created_at),
-        }
-        cache.set(f"task:{task_id}", task_data, timeout=300)
-        save_task_to_db.apply_async((task.id,), countdown=300)
-
+        approval_queue.schedule(task.id)
+
+        delay = getattr(settings, "TASK_APPROVAL_DELAY", 300)
+        minutes, seconds = divmod(delay, 60)
+        if seconds:
+            when = f"{delay} second{pluralize(delay)}"
+        else:
+            when = f"{minutes} minute{pluralize(minutes)}"
         return Response(
-            {"message": "Task has been approved and will be saved in 5 minutes."},
+            {"message": f"Task has been approved and will be saved in {when}."},
             status=200,
         )
 
@@ -188,19 +600,22 @@ class ApproveTaskView(APIView):
 class RevokeApprovalView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def post(self, task_id):
+    def post(self, request, task_id):
+        if request.user.role != "Manager":
+            return Response(
+                {"error": "You do not have permission to revoke approvals."},
+                status=403,
+            )
+
         task = get_object_or_404(Task, id=task_id)
 
-        if task.status != "Approved":
+        if not approval_queue.revoke(task.id) and not task.transition(
+            "Approved", "Pending Approval"
+        ):
             return Response(
                 {"error": "This task cannot be revoked as it is not approved."},
                 status=400,
             )
-        task.status = "Pending Approval"
-        task.save()
-        cache_key = f"task:{task_id}"
-        if cache.get(cache_key):
-            cache.delete(cache_key)
 
         return Response(
             {
@@ -210,9 +625,10 @@ class RevokeApprovalView(APIView):
         )
 
 
-class PendingTasksView(ListAPIView):
+class PendingTasksView(ConditionalListMixin, TaskValuesListMixin, ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = TaskSerializer
+    pagination_class = TaskPagination
 
     def get_queryset(self):
         user = self.request.user
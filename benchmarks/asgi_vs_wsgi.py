@@ -0,0 +1,168 @@
+"""
+Requests/sec and latency percentiles of the task listing under uvicorn,
+served over WSGI (the sync view), over ASGI (the same sync view) and over
+ASGI through the async view.
+
+Each case starts its own ``uvicorn`` process on ``--port``. A throwaway
+Admin user and ``--tasks`` tasks are created for the run and deleted
+afterwards. Pass ``--settings`` to point the servers at another settings
+module (e.g. one with a local cache).
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import percentile, setup
+
+CASES = [
+    ("wsgi  /base/tasks/", "wsgi", "main.wsgi:application", "/base/tasks/"),
+    ("asgi  /base/tasks/", "asgi3", "main.asgi:application", "/base/tasks/"),
+    (
+        "asgi  /base/async/tasks/",
+        "asgi3",
+        "main.asgi:application",
+        "/base/async/tasks/",
+    ),
+]
+
+
+async def load(url, token, requests, concurrency):
+    import httpx
+
+    timings, failures = [], 0
+    queue = iter(range(requests))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    async def worker(client):
+        nonlocal failures
+        for _ in queue:
+            start = time.perf_counter()
+            response = await client.get(url, headers=headers)
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                failures += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return timings, failures, elapsed
+
+
+def wait_for_server(port, process, timeout=20):
+    import socket
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited before accepting connections")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start in time")
+
+
+def run_case(interface, app, path, token, options):
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": options.settings}
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        app,
+        "--interface",
+        interface,
+        "--port",
+        str(options.port),
+        "--workers",
+        str(options.workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    process = subprocess.Popen(command, env=env)
+    try:
+        wait_for_server(options.port, process)
+        url = f"http://127.0.0.1:{options.port}{path}"
+        # Warm up connections, caches and the URL resolver
+        asyncio.run(load(url, token, options.concurrency * 4, options.concurrency))
+        return asyncio.run(load(url, token, options.requests, options.concurrency))
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--settings", default=os.environ.get("DJANGO_SETTINGS_MODULE", "main.settings")
+    )
+    options = parser.parse_args()
+    os.environ["DJANGO_SETTINGS_MODULE"] = options.settings
+    setup()
+
+    from datetime import timedelta
+    from django.utils import timezone
+    from account.models import UserProfile
+    from account.serializers import RoleTokenObtainPairSerializer
+    from base.counters import apply_counter_deltas
+    from base.models import Project, Task
+
+    # The servers run in other processes, so the fixtures must be committed
+    user = UserProfile.objects.create_user(
+        username="bench-asgi",
+        email="bench-asgi@example.com",
+        role="Admin",
+        is_active=True,
+    )
+    try:
+        project = Project.objects.create(
+            name="bench-asgi", description="", created_by=user
+        )
+        due = timezone.now() + timedelta(days=30)
+        Task.objects.bulk_create(
+            Task(
+                title=f"task {index}",
+                description="benchmark",
+                due_date=due,
+                project=project,
+                created_by=user,
+            )
+            for index in range(options.tasks)
+        )
+        # bulk_create skips the signals that maintain the project counters
+        apply_counter_deltas({(project.id, "Pending"): options.tasks})
+        token = str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+
+        print(
+            f"{options.requests} requests, concurrency {options.concurrency}, "
+            f"{options.workers} worker(s)"
+        )
+        for label, interface, app, path in CASES:
+            timings, failures, elapsed = run_case(
+                interface, app, path, token, options
+            )
+            print(
+                f"{label:<26} {len(timings) / elapsed:8.1f} req/s"
+                f"  p50 {percentile(timings, 0.50) * 1e3:7.1f}ms"
+                f"  p99 {percentile(timings, 0.99) * 1e3:7.1f}ms"
+                f"  errors {failures}"
+            )
+    finally:
+        # Tasks and the project cascade with the user
+        user.delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Run them from the repository root as modules, e.g.
+``python -m benchmarks.middleware --requests 5000``. They use the configured
+database and cache; ``--locmem-cache`` swaps the cache for an in-process one
+when no Redis server is available. Rows they create are rolled back.
+"""
+
+import contextlib
+import os
+import statistics
+import time
+
+
+def add_common_arguments(parser):
+    parser.add_argument(
+        "--locmem-cache",
+        action="store_true",
+        help="Use an in-process cache instead of the configured one.",
+    )
+
+
+def setup(locmem_cache=False):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "main.settings")
+    import django
+    from django.conf import settings
+
+    if locmem_cache:
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+    django.setup()
+
+
+@contextlib.contextmanager
+def rolled_back():
+    from django.db import transaction
+
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def measure(func, repeat, warmup=10):
+    """
+    Call ``func`` ``repeat`` times and return its timings in seconds
+    """
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def report(label, timings, unit="us"):
+    scale = {"us": 1e6, "ms": 1e3}[unit]
+    print(
+        f"{label:<40} mean {statistics.fmean(timings) * scale:9.1f}{unit}"
+        f"  p50 {percentile(timings, 0.50) * scale:9.1f}{unit}"
+        f"  p99 {percentile(timings, 0.99) * scale:9.1f}{unit}"
+    )
@@ -0,0 +1,85 @@
+"""
+Per-request overhead of TimeBasedAccessMiddleware, before and after roles
+came from the role cache.
+
+"before" replays the removed implementation: parse the JSON body and load
+the user by username on every request. "after" is the current middleware
+with a warm role cache, plus a cold-cache run where every request misses.
+"""
+
+import argparse
+import json
+
+from benchmarks.common import add_common_arguments, measure, report, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    add_common_arguments(parser)
+    options = parser.parse_args()
+    setup(options.locmem_cache)
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from account.authentication import PayloadUser
+    from account.middleware import TimeBasedAccessMiddleware
+    from account.roles import user_access_key
+    from benchmarks.common import rolled_back
+
+    def get_response(request):
+        return HttpResponse()
+
+    def legacy_middleware(request):
+        # The removed per-request path, minus its debug print
+        username = json.loads(request.body).get("username")
+        user = get_user_model().objects.get(username=username)
+        middleware.check_access(user.role)
+        return get_response(request)
+
+    middleware = TimeBasedAccessMiddleware(get_response)
+    factory = RequestFactory()
+
+    with rolled_back():
+        user = get_user_model().objects.create_user(
+            username="bench-admin", email="bench-admin@example.com", role="Admin"
+        )
+        payload = {"user_id": user.id, "username": user.username}
+
+        def make_request():
+            # A time-restricted route, authenticated as AccessControlMiddleware
+            # leaves it
+            request = factory.post(
+                "/base/create/",
+                json.dumps({"username": user.username}),
+                content_type="application/json",
+            )
+            request.token_payload = payload
+            request.user = PayloadUser(payload)
+            return request
+
+        def before():
+            legacy_middleware(make_request())
+
+        def after():
+            middleware(make_request())
+
+        def after_cold():
+            cache.delete(user_access_key(user.id))
+            middleware(make_request())
+
+        def request_only():
+            make_request()
+
+        baseline = measure(request_only, options.requests)
+        report("request construction (baseline)", baseline)
+        report("before: body parse + user query", measure(before, options.requests))
+        report("after: cached role", measure(after, options.requests))
+        report("after: role cache miss", measure(after_cold, options.requests))
+        cache.delete(user_access_key(user.id))
+
+
+if __name__ == "__main__":
+    main()
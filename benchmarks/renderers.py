@@ -0,0 +1,109 @@
+"""
+Rendering and compression cost of large task listings.
+
+Builds the payload TaskListView returns for N rows (``next``/``previous``
+plus the values-serialized ``results``) and, for each renderer the view
+offers, reports the render time, the body size, and the size and time of
+the gzip and brotli encodings CompressionMiddleware would apply. Brotli and
+the MessagePack renderers are skipped when their packages are missing.
+The tasks are created in a transaction that is rolled back.
+"""
+
+import argparse
+
+from benchmarks.common import add_common_arguments, measure, report, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[500, 5000],
+        help="Row counts of the rendered listings.",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    add_common_arguments(parser)
+    options = parser.parse_args()
+    setup(options.locmem_cache)
+
+    from datetime import timedelta
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+    from django.utils.text import compress_string
+    from rest_framework.renderers import JSONRenderer
+    from base.models import Project, Task
+    from base.serializers import task_values_serializer
+    from base.views import TaskListView
+    from benchmarks.common import rolled_back
+    from main.middleware import CompressionMiddleware, brotli
+    from main.renderers import BINARY_RENDERER_CLASSES, FastJSONRenderer
+
+    renderers = [
+        ("JSONRenderer (stdlib)", JSONRenderer()),
+        ("FastJSONRenderer", FastJSONRenderer()),
+        *((cls.__name__, cls()) for cls in BINARY_RENDERER_CLASSES),
+    ]
+    encodings = [("gzip", compress_string)]
+    if brotli is not None:
+        quality = CompressionMiddleware.brotli_quality
+        encodings.append(("br", lambda body: brotli.compress(body, quality=quality)))
+    # The columnar renderer reads dictionary_fields from the view
+    renderer_context = {"view": TaskListView()}
+
+    with rolled_back():
+        user = get_user_model().objects.create_user(
+            username="bench-admin", email="bench-admin@example.com", role="Admin"
+        )
+        project = Project.objects.create(
+            name="bench", description="benchmark", created_by=user
+        )
+        due_date = timezone.now() + timedelta(days=30)
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {index}",
+                description=f"Benchmark task {index} " * 4,
+                due_date=due_date + timedelta(minutes=index),
+                priority=("Low", "Medium", "High")[index % 3],
+                status=("Pending", "In Progress", "Completed")[index % 3],
+                project=project,
+                assigned_to=user,
+                created_by=user,
+            )
+            for index in range(max(options.rows))
+        )
+
+        # Rows as TaskListView selects them, in its default ordering
+        values = (
+            Task.objects.filter(project=project)
+            .order_by("due_date", "id")
+            .values(*task_values_serializer.sources)
+        )
+        for rows in options.rows:
+            data = {
+                "next": None,
+                "previous": None,
+                "results": task_values_serializer.serialize(list(values[:rows])),
+            }
+
+            print(f"{rows} rows")
+            for name, renderer in renderers:
+                media_type = renderer.media_type
+
+                def render():
+                    return renderer.render(data, media_type, renderer_context)
+
+                body = render()
+                report(f"  {name}", measure(render, options.repeat), unit="ms")
+                sizes = [f"{len(body) / 1024:.0f} KiB raw"]
+                for encoding, compress in encodings:
+                    compressed = compress(body)
+                    timings = measure(lambda: compress(body), options.repeat, warmup=2)
+                    report(f"    {encoding}", timings, unit="ms")
+                    sizes.append(f"{len(compressed) / 1024:.0f} KiB {encoding}")
+                print(f"    size: {', '.join(sizes)}")
+
+
+if __name__ == "__main__":
+    main()
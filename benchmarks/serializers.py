@@ -0,0 +1,103 @@
+"""
+Task list serialization: ``TaskSerializer(many=True)`` over model instances
+against ``task_values_serializer`` over ``.values()`` rows, for N rows.
+
+"serialize" times only the conversion of rows already in memory; "query +
+serialize" also includes fetching them, as the list views do. The tasks are
+created in a transaction that is rolled back.
+"""
+
+import argparse
+
+from benchmarks.common import add_common_arguments, measure, report, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[50, 500, 5000],
+        help="Row counts to serialize.",
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    add_common_arguments(parser)
+    options = parser.parse_args()
+    setup(options.locmem_cache)
+
+    from datetime import timedelta
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+    from base.models import Project, Task
+    from base.serializers import TaskSerializer, task_values_serializer
+    from benchmarks.common import rolled_back
+
+    with rolled_back():
+        user = get_user_model().objects.create_user(
+            username="bench-admin", email="bench-admin@example.com", role="Admin"
+        )
+        project = Project.objects.create(
+            name="bench", description="benchmark", created_by=user
+        )
+        due_date = timezone.now() + timedelta(days=30)
+        Task.objects.bulk_create(
+            Task(
+                title=f"Task {index}",
+                description="Benchmark task " * 4,
+                due_date=due_date,
+                priority=("Low", "Medium", "High")[index % 3],
+                project=project,
+                assigned_to=user,
+                created_by=user,
+            )
+            for index in range(max(options.rows))
+        )
+        tasks = Task.objects.filter(project=project).order_by("id")
+
+        for rows in options.rows:
+
+            def instances():
+                return list(tasks.select_related("project", "assigned_to")[:rows])
+
+            def values():
+                return list(tasks.values(*task_values_serializer.sources)[:rows])
+
+            loaded_instances, loaded_values = instances(), values()
+            print(f"{rows} rows")
+            report(
+                "  serialize: TaskSerializer",
+                measure(
+                    lambda: TaskSerializer(loaded_instances, many=True).data,
+                    options.repeat,
+                ),
+                unit="ms",
+            )
+            report(
+                "  serialize: ValuesSerializer",
+                measure(
+                    lambda: task_values_serializer.serialize(loaded_values),
+                    options.repeat,
+                ),
+                unit="ms",
+            )
+            report(
+                "  query + serialize: TaskSerializer",
+                measure(
+                    lambda: TaskSerializer(instances(), many=True).data,
+                    options.repeat,
+                ),
+                unit="ms",
+            )
+            report(
+                "  query + serialize: ValuesSerializer",
+                measure(
+                    lambda: task_values_serializer.serialize(values()),
+                    options.repeat,
+                ),
+                unit="ms",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+re_accepts_brotli = _lazy_re_compile(r"\bbr\b")
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Negotiated response compression above ``RESPONSE_COMPRESSION_MIN_SIZE``
+    bytes: brotli when the ``brotli`` package is installed and the client
+    accepts it, gzip otherwise.
+    """
+
+    brotli_quality = 4
+
+    def process_response(self, request, response):
+        min_size = getattr(settings, "RESPONSE_COMPRESSION_MIN_SIZE", 1024)
+        if not response.streaming and len(response.content) < min_size:
+            return response
+        # Already-compressed downloads such as gzip task exports
+        if response.get("Content-Type", "").startswith("application/gzip"):
+            return response
+
+        accept_encoding = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if (
+            brotli is None
+            or response.has_header("Content-Encoding")
+            or not re_accepts_brotli.search(accept_encoding)
+            or (response.streaming and response.is_async)
+        ):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        if response.streaming:
+            response.streaming_content = self.compress_sequence(
+                response.streaming_content
+            )
+            del response.headers["Content-Length"]
+        else:
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
+
+    def compress_sequence(self, sequence):
+        compressor = brotli.Compressor(quality=self.brotli_quality)
+        for chunk in sequence:
+            # Flush per chunk so streamed bytes still go out immediately
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
@@ -0,0 +1,125 @@
+"""
+JSON renderer and parser backed by orjson when it is installed.
+
+orjson encodes datetimes natively (``...Z`` for UTC, like DRF's encoder), so
+task payloads need no per-value Python conversion. Without orjson both
+classes behave exactly like DRF's stdlib-based ones.
+
+The MessagePack renderers are only offered when ``msgpack`` is installed,
+see ``BINARY_RENDERER_CLASSES``.
+"""
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Indented output (e.g. the browsable API) keeps the stdlib path
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+def to_columns(rows, fields=None, dictionary_fields=()):
+    """
+    Turn uniform rows into ``{"count", "fields", "columns"}`` with one array
+    of values per field.
+
+    ``rows`` are dicts, or sequences ordered like ``fields``. Columns named
+    in ``dictionary_fields`` are sent as ``{"dictionary", "codes"}`` where
+    each code indexes the dictionary of distinct values.
+    """
+    if fields is None:
+        fields = list(rows[0]) if rows else []
+        keys = fields
+    else:
+        keys = range(len(fields))
+    columns = {}
+    for field, key in zip(fields, keys):
+        values = [row[key] for row in rows]
+        if field in dictionary_fields:
+            codes = {}
+            encoded = [codes.setdefault(value, len(codes)) for value in values]
+            values = {"dictionary": list(codes), "codes": encoded}
+        columns[field] = values
+    return {"count": len(rows), "fields": fields, "columns": columns}
+
+
+def msgpack_packer():
+    # Aware datetimes become MessagePack timestamps, anything else msgpack
+    # cannot encode goes through DRF's JSON encoder (Decimal, lazy strings...)
+    return msgpack.Packer(default=JSONEncoder().default, datetime=True)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack_packer().pack(data)
+
+
+class ColumnarMessagePackRenderer(MessagePackRenderer):
+    """
+    MessagePack with lists of rows, including paginated ``results``, sent
+    column by column (see ``to_columns``). The view's ``dictionary_fields``
+    are dictionary-encoded.
+    """
+
+    media_type = "application/x-msgpack-columnar"
+    format = "msgpack-columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        view = (renderer_context or {}).get("view")
+        dictionary_fields = getattr(view, "dictionary_fields", ())
+        if isinstance(data, list):
+            data = to_columns(data, dictionary_fields=dictionary_fields)
+        elif isinstance(data, dict) and isinstance(data.get("results"), list):
+            data = {
+                **data,
+                "results": to_columns(
+                    data["results"], dictionary_fields=dictionary_fields
+                ),
+            }
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+# Extra renderers for bulk task reads, empty when msgpack is not installed
+BINARY_RENDERER_CLASSES = (
+    [MessagePackRenderer, ColumnarMessagePackRenderer] if msgpack is not None else []
+)
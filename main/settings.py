@@ -52,6 +52,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "main.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -116,10 +117,23 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "account.authentication.TokenPayloadAuthentication",
+    ),
+    # orjson-backed when installed, stdlib json otherwise
+    "DEFAULT_RENDERER_CLASSES": (
+        "main.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "main.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
 }
 
+# Responses smaller than this are sent uncompressed
+RESPONSE_COMPRESSION_MIN_SIZE = 1024
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": datetime.timedelta(days=1),
@@ -142,7 +156,39 @@ SIMPLE_JWT = {
 
 AUTH_USER_MODEL = "account.UserProfile"
 
+# Completed-task retention (see base.retention): days kept when no active
+# task_expiry TaskConfigurations row exists, rows per delete transaction and
+# seconds to pause between chunks
 TASK_DELETION_DAYS = 2
+TASK_RETENTION_CHUNK_SIZE = 1000
+TASK_RETENTION_SLEEP = 0
+# Retention deletes with raw DELETEs and applies the effects of base.signals'
+# Task post_delete receiver itself; set to False once another app adds one
+TASK_RAW_DELETE = True
+# Move expired completed tasks to base.ArchivedTask instead of dropping them
+TASK_ARCHIVE_COMPLETED = True
+
+# Seconds between checks of the TaskConfigurations version key (base.config)
+CONFIG_REGISTRY_CHECK_INTERVAL = 5
+
+# Batch endpoints (see base.bulk)
+TASK_BULK_BATCH_SIZE = 500
+TASK_BULK_MAX_ITEMS = 50000
+
+# Rows fetched per database round trip by task exports
+TASK_EXPORT_CHUNK_SIZE = 2000
+
+# How long deletions stay visible to the incremental sync endpoint, and how
+# many seconds it trails the clock so in-flight writes commit before it reads
+TASK_TOMBSTONE_RETENTION_DAYS = 30
+TASK_SYNC_SAFETY_LAG = 5
+
+# Delayed approvals (see base.approvals): seconds until an approval is saved,
+# how long a revocation of an in-flight approval is remembered, and how long
+# a sweeper may hold claimed approvals before they are requeued
+TASK_APPROVAL_DELAY = 300
+TASK_APPROVAL_REVOKE_TTL = 3600
+TASK_APPROVAL_LEASE = 300
 
 
 CELERY_RESULT_BACKEND = "django-db"
@@ -169,6 +215,13 @@ CACHES = {
     }
 }
 
+# Versioned read-through cache (see base.caching)
+READ_CACHE_TIMEOUT = 300
+READ_CACHE_LOCK_TIMEOUT = 10
+READ_CACHE_WAIT_RETRIES = 20
+# Lifetime of the per-object version counters
+READ_CACHE_VERSION_TIMEOUT = 60 * 60 * 24
+
 
 # Celery settings for periodic tasks
 CELERY_BEAT_SCHEDULE = {
@@ -176,6 +229,14 @@ CELERY_BEAT_SCHEDULE = {
         "task": "base.task.delete_old_completed_tasks",
         "schedule": 4.0,  # Run weekly (in seconds)604800
     },
+    "sweep_due_approvals": {
+        "task": "base.task.sweep_due_approvals",
+        "schedule": 15.0,
+    },
+    "purge_task_tombstones_daily": {
+        "task": "base.task.purge_task_tombstones",
+        "schedule": 86400.0,
+    },
 }
 
 
@@ -228,3 +289,6 @@ STATIC_URL = "static/"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 BACKEND_SERVER_BASE_URL = "http://localhost:8000"
+
+# Maximum number of validated JWT payloads kept by AccessControlMiddleware
+ACCESS_TOKEN_CACHE_SIZE = 1024